@@ -6,23 +6,85 @@ Combines SQLite and Neo4j configuration in one module.
 
 import os
 from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
+from typing import Optional
 
 
 # ============================================================================
 # SQLite Configuration
 # ============================================================================
 
+@lru_cache(maxsize=8)
+def _resolve_db_path(override: Optional[str]) -> Path:
+    """Build the database Path once per distinct SQLITE_DB_PATH value."""
+    if override:
+        return Path(override)
+    return Path(__file__).parent.parent / "data" / "claude_hooks.db"
+
+
 def get_db_path() -> Path:
     """Get SQLite database path from environment or default.
 
     Environment variable: SQLITE_DB_PATH
 
+    The resolved Path is cached per environment value, so repeated readers
+    and writers in one process reuse it while a changed override still
+    takes effect.
+
     Returns:
         Path to the SQLite database file
     """
-    default = Path(__file__).parent.parent / "data" / "claude_hooks.db"
-    return Path(os.environ.get("SQLITE_DB_PATH", default))
+    return _resolve_db_path(os.environ.get("SQLITE_DB_PATH"))
+
+
+# Per-connection tuning: relaxed fsync (safe under WAL), memory-mapped reads,
+# 64 MiB page cache, in-memory temp tables for sorts/GROUP BY, and a cap on
+# the size the WAL file is truncated back to after a checkpoint.
+SQLITE_CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA journal_size_limit=6144000",
+)
+
+
+def configure_sqlite_connection(conn) -> None:
+    """Apply journal mode and per-connection PRAGMAs to a SQLite connection.
+
+    WAL is persistent in the database file, so the (lock-taking) switch is
+    only attempted when the file is not already in WAL mode.
+
+    Args:
+        conn: Open sqlite3.Connection
+    """
+    import sqlite3
+    try:
+        if conn.execute("PRAGMA journal_mode").fetchone()[0].lower() != "wal":
+            conn.execute("PRAGMA journal_mode=WAL")
+    except sqlite3.OperationalError:
+        pass  # Locked by another connection; keep the current journal mode
+    for pragma in SQLITE_CONNECTION_PRAGMAS:
+        conn.execute(pragma)
+
+
+def optimize_sqlite_connection(conn) -> None:
+    """Let SQLite refresh planner statistics before a connection closes.
+
+    PRAGMA optimize only analyzes tables whose queries on this connection
+    would have benefited, and analysis_limit bounds each ANALYZE to a
+    sample, so this stays cheap on a large events table.
+
+    Args:
+        conn: Open sqlite3.Connection that is about to be closed
+    """
+    import sqlite3
+    try:
+        conn.execute("PRAGMA analysis_limit=400")
+        conn.execute("PRAGMA optimize")
+    except sqlite3.OperationalError:
+        pass  # Busy or read-only; statistics can wait for the next close
 
 
 def is_sqlite_available() -> bool:
@@ -72,6 +134,7 @@ class Neo4jConfig:
     max_connection_pool_size: int = 50
     connection_timeout: float = 5.0
     max_connection_lifetime: float = 30.0
+    connection_acquisition_timeout: float = 30.0
 
 
 def load_neo4j_config() -> Neo4jConfig:
@@ -4,13 +4,21 @@ import hashlib
 import json
 import platform
 import re
+import os
 import subprocess
 import sys
+import time
 from dataclasses import dataclass, field
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
+try:
+    import orjson  # Optional: C encoder for the per-event raw_json payloads
+except ImportError:
+    orjson = None
+
 
 # Tool category classification
 TOOL_CATEGORIES = {
@@ -23,7 +31,11 @@ TOOL_CATEGORIES = {
     'plan': ['EnterPlanMode', 'ExitPlanMode'],
 }
 
+# Flattened TOOL_CATEGORIES for a single dict lookup per tool name
+TOOL_TO_CATEGORY = {tool: category for category, tools in TOOL_CATEGORIES.items() for tool in tools}
+
 
+@lru_cache(maxsize=128)
 def classify_tool(tool_name: str) -> str:
     """Classify tool into category.
 
@@ -40,10 +52,7 @@ def classify_tool(tool_name: str) -> str:
     if tool_name.startswith('mcp__'):
         return 'mcp'
 
-    for category, tools in TOOL_CATEGORIES.items():
-        if tool_name in tools:
-            return category
-    return 'other'
+    return TOOL_TO_CATEGORY.get(tool_name, 'other')
 
 
 def classify_intent(prompt_text: str) -> str:
@@ -170,6 +179,10 @@ def extract_subagent_type(tool_name: str, tool_input: dict) -> Optional[str]:
     return tool_input.get('subagent_type')
 
 
+# Characters encoded per hasher.update() in compute_prompt_hash
+PROMPT_HASH_CHUNK_CHARS = 65536
+
+
 def compute_prompt_hash(prompt_text: str) -> str:
     """Compute SHA256 hash of prompt for deduplication.
 
@@ -179,9 +192,11 @@ def compute_prompt_hash(prompt_text: str) -> str:
     Returns:
         SHA256 hex digest
     """
-    if not prompt_text:
-        return hashlib.sha256(b'').hexdigest()
-    return hashlib.sha256(prompt_text.encode('utf-8')).hexdigest()
+    # Encode in slices so a very long prompt is never copied to bytes whole
+    hasher = hashlib.sha256()
+    for start in range(0, len(prompt_text or ''), PROMPT_HASH_CHUNK_CHARS):
+        hasher.update(prompt_text[start:start + PROMPT_HASH_CHUNK_CHARS].encode('utf-8'))
+    return hasher.hexdigest()
 
 
 def count_words(text: str) -> int:
@@ -198,6 +213,11 @@ def count_words(text: str) -> int:
     return len(text.split())
 
 
+# Error indicators in tool output, matched case-insensitively in one pass
+# ('permission denied' is covered by 'denied')
+ERROR_KEYWORD_PATTERN = re.compile(r'error|failed|exception|traceback|fatal|denied', re.IGNORECASE)
+
+
 def detect_success(tool_response: Any) -> Tuple[bool, Optional[str], bool, bool]:
     """Analyze tool response for success/failure.
 
@@ -214,15 +234,18 @@ def detect_success(tool_response: Any) -> Tuple[bool, Optional[str], bool, bool]
     if isinstance(tool_response, dict):
         stderr = tool_response.get('stderr', '') or ''
         stdout = tool_response.get('stdout', '') or ''
+        # Non-str streams (lists, numbers) are checked via their str() form
+        if not isinstance(stderr, str):
+            stderr = str(stderr)
+        if not isinstance(stdout, str):
+            stdout = str(stdout)
         interrupted = tool_response.get('interrupted', False)
 
         has_stderr = bool(stderr and stderr.strip())
 
         # Check for error indicators
-        combined_output = f"{stdout} {stderr}".lower()
-        error_keywords = ['error', 'failed', 'exception', 'traceback', 'fatal', 'denied', 'permission denied']
-
-        has_error = any(kw in combined_output for kw in error_keywords)
+        search = ERROR_KEYWORD_PATTERN.search
+        has_error = bool(search(stderr) or search(stdout))
 
         error_msg = None
         if has_error:
@@ -231,8 +254,7 @@ def detect_success(tool_response: Any) -> Tuple[bool, Optional[str], bool, bool]
                 error_msg = stderr.strip()[:500]
             elif stdout:
                 # Extract error lines from stdout
-                error_lines = [line for line in stdout.split('\n')
-                              if any(kw in line.lower() for kw in error_keywords)]
+                error_lines = [line for line in stdout.split('\n') if search(line)]
                 if error_lines:
                     error_msg = '\n'.join(error_lines[:5])[:500]
 
@@ -240,17 +262,73 @@ def detect_success(tool_response: Any) -> Tuple[bool, Optional[str], bool, bool]
         return success, error_msg, has_stderr, bool(interrupted)
 
     # Handle string response
-    output_str = str(tool_response).lower()
-    error_keywords = ['error', 'failed', 'exception', 'traceback', 'fatal', 'denied']
-    has_error = any(kw in output_str for kw in error_keywords)
+    return _detect_text_success(str(tool_response))
+
+
+def _detect_text_success(text: str) -> Tuple[bool, Optional[str], bool, bool]:
+    """detect_success() for a response already converted to str."""
+    has_error = ERROR_KEYWORD_PATTERN.search(text) is not None
 
     error_msg = None
     if has_error:
-        error_msg = str(tool_response)[:500]
+        error_msg = text[:500]
 
     return not has_error, error_msg, False, False
 
 
+def _text_size(text: str) -> int:
+    """UTF-8 byte length of text; ASCII text is measured without encoding."""
+    return len(text) if text.isascii() else len(text.encode('utf-8'))
+
+
+def analyze_tool_response(tool_response: Any) -> Tuple[bool, Optional[str], bool, bool, int]:
+    """detect_success() and get_output_size() in one call.
+
+    Non-dict responses are converted with str() once and shared by both
+    checks.
+
+    Args:
+        tool_response: The tool response (dict or string)
+
+    Returns:
+        Tuple of (success, error_message, has_stderr, was_interrupted, output_size_bytes)
+    """
+    if tool_response is None:
+        return True, None, False, False, 0
+    if isinstance(tool_response, dict):
+        return (*detect_success(tool_response), get_output_size(tool_response))
+
+    text = str(tool_response)
+    return (*_detect_text_success(text), _text_size(text))
+
+
+# Compact separators for stored JSON (matches orjson's output shape)
+JSON_SEPARATORS = (',', ':')
+
+
+def json_dumps(value: Any) -> str:
+    """Serialize a value to a JSON string, using orjson when it is installed.
+
+    Output is compact (no whitespace after separators) with either
+    encoder. Unsupported types are stringified, as with
+    json.dumps(default=str). Values orjson rejects (e.g. integers beyond
+    64 bits, lone surrogates) fall back to the stdlib encoder, which
+    escapes non-ASCII so the text always encodes as UTF-8.
+
+    Args:
+        value: JSON-compatible value
+
+    Returns:
+        JSON text
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(value, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+        except TypeError:
+            pass
+    return json.dumps(value, default=str, separators=JSON_SEPARATORS)
+
+
 def get_output_size(tool_response: Any) -> int:
     """Calculate response size in bytes.
 
@@ -263,8 +341,8 @@ def get_output_size(tool_response: Any) -> int:
     if tool_response is None:
         return 0
     if isinstance(tool_response, dict):
-        return len(json.dumps(tool_response, default=str).encode('utf-8'))
-    return len(str(tool_response).encode('utf-8'))
+        return _text_size(json.dumps(tool_response, default=str))
+    return _text_size(str(tool_response))
 
 
 def get_git_branch() -> Optional[str]:
@@ -288,19 +366,75 @@ def get_git_branch() -> Optional[str]:
     return None
 
 
+# How long a looked-up git branch is reused before asking git again
+GIT_BRANCH_TTL_SECONDS = 60.0
+
+# cwd -> (expiry on the monotonic clock, branch)
+_git_branch_cache: Dict[str, Tuple[float, Optional[str]]] = {}
+
+
+def get_cached_git_branch() -> Optional[str]:
+    """Get the git branch, reusing the last lookup for the current directory.
+
+    get_git_branch() forks git; long-running callers (e.g. the subagent
+    transcript logger) would otherwise pay that once per event. Entries
+    expire after GIT_BRANCH_TTL_SECONDS so branch switches are picked up.
+
+    Returns:
+        Branch name or None if not in a git repo
+    """
+    try:
+        cwd = os.getcwd()
+    except OSError:
+        # Working directory was removed; nothing stable to cache under
+        return get_git_branch()
+    now = time.monotonic()
+    cached = _git_branch_cache.get(cwd)
+    if cached and cached[0] > now:
+        return cached[1]
+
+    branch = get_git_branch()
+    _git_branch_cache[cwd] = (now + GIT_BRANCH_TTL_SECONDS, branch)
+    return branch
+
+
+@lru_cache(maxsize=1)
+def _platform_context() -> Tuple[str, str]:
+    """Platform and Python version; fixed for the life of the process."""
+    return f"{platform.system()} {platform.release()}", platform.python_version()
+
+
 def get_environment_context() -> dict:
     """Gather environment context information.
 
     Returns:
         Dict with git_branch, platform, python_version
     """
+    platform_name, python_version = _platform_context()
     return {
-        'git_branch': get_git_branch(),
-        'platform': f"{platform.system()} {platform.release()}",
-        'python_version': platform.python_version()
+        'git_branch': get_cached_git_branch(),
+        'platform': platform_name,
+        'python_version': python_version,
     }
 
 
+# Key substrings whose values are redacted by sanitize_tool_input()
+SENSITIVE_KEY_PATTERN = re.compile(
+    r'password|api_key|token|secret|auth|credential|key', re.IGNORECASE
+)
+
+
+@lru_cache(maxsize=1024)
+def _is_sensitive_key(key: str) -> bool:
+    """Whether a tool-input key names a sensitive value.
+
+    Tool inputs reuse a small vocabulary of keys (command, file_path,
+    pattern, ...), so the regex verdict is memoized per key and repeat
+    keys cost one dict probe.
+    """
+    return SENSITIVE_KEY_PATTERN.search(key) is not None
+
+
 def sanitize_tool_input(tool_input: dict) -> dict:
     """Remove sensitive data from tool inputs before storage.
 
@@ -313,18 +447,12 @@ def sanitize_tool_input(tool_input: dict) -> dict:
     if not tool_input:
         return {}
 
-    sensitive_keys = ['password', 'api_key', 'token', 'secret', 'auth', 'credential', 'key']
-    sanitized = {}
-
-    for key, value in tool_input.items():
-        if any(sensitive in key.lower() for sensitive in sensitive_keys):
-            sanitized[key] = '[REDACTED]'
-        elif isinstance(value, dict):
-            sanitized[key] = sanitize_tool_input(value)
-        else:
-            sanitized[key] = value
-
-    return sanitized
+    return {
+        key: '[REDACTED]' if _is_sensitive_key(key)
+        else sanitize_tool_input(value) if isinstance(value, dict)
+        else value
+        for key, value in tool_input.items()
+    }
 
 
 def normalize_path(path: str) -> Optional[str]:
@@ -338,7 +466,8 @@ def normalize_path(path: str) -> Optional[str]:
     """
     if not path:
         return None
-    return path.replace('\\', '/')
+    # Already POSIX in the common case: one scan, no new string
+    return path.replace('\\', '/') if '\\' in path else path
 
 
 # -----------------------------------------------------------------------------
@@ -1,5 +1,8 @@
 """
 Data models for Claude Code CLI hook events.
+
+All models use slots=True: events are created per tool call, so dropping the
+per-instance __dict__ keeps memory flat over long sessions.
 """
 
 from dataclasses import dataclass, field
@@ -7,7 +10,7 @@ from datetime import datetime
 from typing import Any
 
 
-@dataclass
+@dataclass(slots=True)
 class CLISessionStartEvent:
     """SessionStart hook event data."""
 
@@ -17,7 +20,7 @@ class CLISessionStartEvent:
     metadata: dict[str, Any] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class CLISessionEndEvent:
     """SessionEnd hook event data."""
 
@@ -28,7 +31,7 @@ class CLISessionEndEvent:
     prompt_count: int = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class CLIToolCallEvent:
     """PreToolUse hook event data."""
 
@@ -40,14 +43,14 @@ class CLIToolCallEvent:
     sequence_index: int = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class CLIToolResultEvent:
     """PostToolUse hook event data."""
 
     session_id: str
     tool_name: str
     tool_input: dict[str, Any]
-    tool_output: str
+    tool_output: Any  # str, or the decoded dict/list response; rendered by the graph writer
     timestamp: datetime
     call_id: str
     duration_ms: float | None = None
@@ -71,7 +74,7 @@ class CLIToolResultEvent:
     grep_matches: list[dict] = field(default_factory=list)  # Grep file matches
 
 
-@dataclass
+@dataclass(slots=True)
 class CLIPromptEvent:
     """UserPromptSubmit hook event data."""
 
@@ -82,7 +85,7 @@ class CLIPromptEvent:
     sequence_index: int = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class FileAccessEvent:
     """Individual file access event for the file_access_log table.
 
@@ -10,7 +10,8 @@ from pathlib import Path
 
 # Add hooks root to path for imports
 HOOKS_DIR = Path(__file__).resolve().parent.parent
-sys.path.insert(0, str(HOOKS_DIR))
+if str(HOOKS_DIR) not in sys.path:
+    sys.path.insert(0, str(HOOKS_DIR))
 
 from core.config import is_sqlite_available
 from sqlite.writer import CLISqliteWriter
@@ -11,7 +11,8 @@ from pathlib import Path
 
 # Add hooks root to path for imports
 HOOKS_DIR = Path(__file__).resolve().parent.parent
-sys.path.insert(0, str(HOOKS_DIR))
+if str(HOOKS_DIR) not in sys.path:
+    sys.path.insert(0, str(HOOKS_DIR))
 
 from core.config import is_sqlite_available
 from core.helpers import (
@@ -56,16 +57,15 @@ def main():
             # Log the SubagentStop event itself
             writer.log_event(parent_session_id, 'SubagentStop', data)
 
-            # Parse SUBAGENT transcript and log each tool call
+            # Parse SUBAGENT transcript and log its tool calls in one batch
             tool_calls = parse_transcript_tool_calls(agent_transcript_path)
 
-            for tool_call in tool_calls:
-                writer.log_subagent_tool_call(
-                    parent_session_id=parent_session_id,
-                    agent_id=agent_id,
-                    tool_call=tool_call,
-                    subagent_type=subagent_type,
-                )
+            writer.log_subagent_tool_calls(
+                parent_session_id=parent_session_id,
+                agent_id=agent_id,
+                tool_calls=tool_calls,
+                subagent_type=subagent_type,
+            )
 
             if tool_calls:
                 print(f"[CLI Hook] SubagentStop: Logged {len(tool_calls)} tool calls from subagent {agent_id}...", file=sys.stderr)
@@ -7,7 +7,8 @@ from pathlib import Path
 
 # Add hooks root to path for imports
 HOOKS_DIR = Path(__file__).resolve().parent.parent
-sys.path.insert(0, str(HOOKS_DIR))
+if str(HOOKS_DIR) not in sys.path:
+    sys.path.insert(0, str(HOOKS_DIR))
 
 # Add domo directory to path for machine detection
 DOMO_DIR = HOOKS_DIR.parent.parent / "domo"
@@ -61,104 +62,110 @@ def sync_session_to_neo4j(session_id: str) -> bool:
         machine_id = _detect_machine_id()
 
         with CLISqliteReader() as reader, CLINeo4jWriter() as writer:
-            # 1. Get session start event and create session node
-            start_event = reader.get_session_start_event(session_id)
-            if start_event:
-                session_start = CLISessionStartEvent(
-                    session_id=session_id,
-                    timestamp=_parse_timestamp(start_event['timestamp']),
-                    working_dir=start_event.get('cwd') or '',
-                    metadata={
-                        'platform': start_event.get('platform'),
-                        'git_branch': start_event.get('git_branch'),
-                        'python_version': start_event.get('python_version')
-                    }
-                )
-                writer.create_session_node(session_start, machine_id=machine_id)
-            else:
-                # Create a minimal session node if no start event exists
-                session_start = CLISessionStartEvent(
-                    session_id=session_id,
-                    timestamp=datetime.now(),
-                    working_dir='',
-                    metadata={}
-                )
-                writer.create_session_node(session_start, machine_id=machine_id)
-
-            # 2. Create prompt nodes
-            prompts = reader.get_prompts(session_id)
-            for prompt_row in prompts:
-                prompt_event = CLIPromptEvent(
-                    session_id=session_id,
-                    prompt_text=prompt_row.get('prompt_text') or '',
-                    timestamp=_parse_timestamp(prompt_row['timestamp']),
-                    intent_type=prompt_row.get('intent_type'),
-                    sequence_index=prompt_row.get('sequence_index') or 0,
-                )
-                writer.create_prompt_node(prompt_event)
-
-            # 3. Create tool call nodes
-            tool_calls = reader.get_tool_calls(session_id)
-            for tool_row in tool_calls:
-                # Parse raw_json to get original tool_input
-                raw_data = {}
-                if tool_row.get('raw_json'):
-                    try:
-                        raw_data = json.loads(tool_row['raw_json'])
-                    except json.JSONDecodeError:
-                        pass
-
-                tool_input = raw_data.get('tool_input') or raw_data.get('toolInput') or {}
-                tool_output = raw_data.get('tool_response') or raw_data.get('toolOutput') or ''
-
-                tool_event = CLIToolResultEvent(
-                    session_id=session_id,
-                    tool_name=tool_row.get('tool_name') or 'unknown',
-                    tool_input=tool_input,
-                    tool_output=str(tool_output),
-                    timestamp=_parse_timestamp(tool_row['timestamp']),
-                    call_id=tool_row.get('tool_use_id') or '',
-                    duration_ms=tool_row.get('duration_ms'),
-                    success=bool(tool_row.get('success', 1)),
-                    error=tool_row.get('error_message'),
-                    # Extract enriched fields from SQLite columns
-                    tool_category=tool_row.get('tool_category'),
-                    subagent_type=tool_row.get('subagent_type'),
-                    command=tool_row.get('command'),
-                    pattern=tool_row.get('pattern'),
-                    url=tool_row.get('url'),
-                    file_path=tool_row.get('file_path'),
-                    output_size_bytes=tool_row.get('output_size_bytes'),
-                    has_stderr=bool(tool_row.get('has_stderr', 0)),
-                    sequence_index=tool_row.get('sequence_index') or 0,
-                )
-                writer.create_tool_call_node(tool_event)
-
-            # 4. Complete session with end data
-            end_event = reader.get_session_end_event(session_id)
-            if end_event:
-                duration_ms = end_event.get('duration_ms') or 0
-                duration_seconds = duration_ms / 1000.0
-
-                session_end = CLISessionEndEvent(
-                    session_id=session_id,
-                    timestamp=_parse_timestamp(end_event['timestamp']),
-                    duration_seconds=duration_seconds,
-                    tool_count=len(tool_calls),
-                    prompt_count=len(prompts)
-                )
-                writer.complete_session_node(session_end)
-
-            # 5. Sync file accesses and build co-access relationships
-            _sync_file_accesses(session_id, reader, writer)
-
-            # 6. Sync subagent data
-            _sync_subagent_data(session_id, reader, writer)
-
-            # 7. Create metrics summary
-            writer.create_metrics_summary(session_id)
-
-            # 8. Mark session as synced in SQLite
+            # Start/end events, prompts and tool calls in one SQLite query
+            bundle = reader.get_session_bundle(session_id)
+
+            # All graph writes for the session share one transaction
+            with writer.batch() as tx:
+                # 1. Get session start event and create session node
+                start_event = bundle['start']
+                if start_event:
+                    session_start = CLISessionStartEvent(
+                        session_id=session_id,
+                        timestamp=_parse_timestamp(start_event['timestamp']),
+                        working_dir=start_event['cwd'] or '',
+                        metadata={
+                            'platform': start_event['platform'],
+                            'git_branch': start_event['git_branch'],
+                            'python_version': start_event['python_version']
+                        }
+                    )
+                    tx.create_session_node(session_start, machine_id=machine_id)
+                else:
+                    # Create a minimal session node if no start event exists
+                    session_start = CLISessionStartEvent(
+                        session_id=session_id,
+                        timestamp=datetime.now(),
+                        working_dir='',
+                        metadata={}
+                    )
+                    tx.create_session_node(session_start, machine_id=machine_id)
+
+                # 2. Create prompt nodes
+                prompts = bundle['prompts']
+                for prompt_row in prompts:
+                    prompt_event = CLIPromptEvent(
+                        session_id=session_id,
+                        prompt_text=prompt_row['prompt_text'] or '',
+                        timestamp=_parse_timestamp(prompt_row['timestamp']),
+                        intent_type=prompt_row['intent_type'],
+                        sequence_index=prompt_row['sequence_index'] or 0,
+                    )
+                    tx.create_prompt_node(prompt_event)
+
+                # 3. Create tool call nodes
+                tool_calls = bundle['tool_calls']
+                for tool_row in tool_calls:
+                    # Parse raw_json to get original tool_input
+                    raw_data = {}
+                    if tool_row['raw_json']:
+                        try:
+                            raw_data = json.loads(tool_row['raw_json'])
+                        except json.JSONDecodeError:
+                            pass
+
+                    tool_input = raw_data.get('tool_input') or raw_data.get('toolInput') or {}
+                    tool_output = raw_data.get('tool_response') or raw_data.get('toolOutput') or ''
+
+                    tool_event = CLIToolResultEvent(
+                        session_id=session_id,
+                        tool_name=tool_row['tool_name'] or 'unknown',
+                        tool_input=tool_input,
+                        tool_output=tool_output,
+                        timestamp=_parse_timestamp(tool_row['timestamp']),
+                        call_id=tool_row['tool_use_id'] or '',
+                        duration_ms=tool_row['duration_ms'],
+                        success=bool(tool_row['success']),
+                        error=tool_row['error_message'],
+                        # Extract enriched fields from SQLite columns
+                        tool_category=tool_row['tool_category'],
+                        subagent_type=tool_row['subagent_type'],
+                        command=tool_row['command'],
+                        pattern=tool_row['pattern'],
+                        url=tool_row['url'],
+                        file_path=tool_row['file_path'],
+                        output_size_bytes=tool_row['output_size_bytes'],
+                        has_stderr=bool(tool_row['has_stderr']),
+                        sequence_index=tool_row['sequence_index'] or 0,
+                    )
+                    tx.create_tool_call_node(tool_event)
+
+                # 4. Complete session with end data
+                end_event = bundle['end']
+                if end_event:
+                    duration_ms = end_event['duration_ms'] or 0
+                    duration_seconds = duration_ms / 1000.0
+
+                    session_end = CLISessionEndEvent(
+                        session_id=session_id,
+                        timestamp=_parse_timestamp(end_event['timestamp']),
+                        duration_seconds=duration_seconds,
+                        tool_count=len(tool_calls),
+                        prompt_count=len(prompts)
+                    )
+                    tx.complete_session_node(session_end)
+
+                # 5. Sync file accesses and build co-access relationships
+                _sync_file_accesses(session_id, reader, tx)
+
+                # 6. Sync subagent data
+                _sync_subagent_data(session_id, reader, tx)
+
+                # 7. Create metrics summary
+                tx.create_metrics_summary(session_id)
+
+            # 8. Mark session and its file accesses as synced in SQLite
+            reader.mark_file_accesses_synced(session_id)
             reader.mark_session_synced(session_id)
 
             return True
@@ -183,13 +190,12 @@ def sync_all_unsynced_sessions() -> int:
 
     try:
         with CLISqliteReader() as reader:
-            unsynced = reader.get_unsynced_sessions()
-
-            for session_id in unsynced:
-                # Only sync completed sessions
-                if reader.is_session_complete(session_id):
-                    if sync_session_to_neo4j(session_id):
-                        synced_count += 1
+            for batch in reader.iter_unsynced_session_batches():
+                for session_id in batch:
+                    # Only sync completed sessions
+                    if reader.is_session_complete(session_id):
+                        if sync_session_to_neo4j(session_id):
+                            synced_count += 1
 
     except Exception as e:
         print(f"[Hook] Batch sync failed: {e}", file=sys.stderr)
@@ -213,9 +219,11 @@ def _sync_subagent_data(session_id: str, reader: CLISqliteReader,
     if not agent_ids:
         return
 
+    # Fetch every subagent's tool calls in one query, grouped by agent
+    calls_by_agent = reader.get_subagent_tool_calls_bulk(agent_ids)
+
     for agent_id in agent_ids:
-        # Get all tool calls for this subagent
-        tool_calls = reader.get_subagent_tool_calls(agent_id)
+        tool_calls = calls_by_agent.get(agent_id)
 
         if not tool_calls:
             continue
@@ -224,12 +232,12 @@ def _sync_subagent_data(session_id: str, reader: CLISqliteReader,
         subagent_type = None
         transcript_path = None
         for tc in tool_calls:
-            if tc.get('subagent_type'):
+            if tc['subagent_type']:
                 subagent_type = tc['subagent_type']
                 break
 
         # Get timestamp from last tool call
-        last_timestamp = _parse_timestamp(tool_calls[-1].get('timestamp', ''))
+        last_timestamp = _parse_timestamp(tool_calls[-1]['timestamp'])
 
         # Create SubagentSession node
         writer.create_subagent_session(
@@ -245,19 +253,19 @@ def _sync_subagent_data(session_id: str, reader: CLISqliteReader,
         for tool_row in tool_calls:
             # Parse raw_json if available
             raw_data = {}
-            if tool_row.get('raw_json'):
+            if tool_row['raw_json']:
                 try:
                     raw_data = json.loads(tool_row['raw_json'])
                 except json.JSONDecodeError:
                     pass
 
             tool_data = {
-                'tool_name': tool_row.get('tool_name'),
+                'tool_name': tool_row['tool_name'],
                 'tool_input': raw_data.get('tool_input') or {},
-                'tool_use_id': tool_row.get('tool_use_id'),
-                'timestamp': tool_row.get('timestamp'),
+                'tool_use_id': tool_row['tool_use_id'],
+                'timestamp': tool_row['timestamp'],
                 'tool_result': raw_data.get('tool_result'),
-                'success': bool(tool_row.get('success', 1)),
+                'success': bool(tool_row['success']),
             }
 
             writer.create_subagent_tool_call(
@@ -274,40 +282,36 @@ def _sync_file_accesses(session_id: str, reader: CLISqliteReader,
     Sync file access data to Neo4j and build co-access relationships.
 
     Creates UnifiedFile nodes for all accessed files, links them to tool calls,
-    and establishes CO_ACCESSED_WITH relationships between files accessed in
-    the same session.
+    and establishes CO_ACCESSED_WITH relationships between files accessed
+    close together in the same session.
 
     Args:
         session_id: Session identifier
         reader: SQLite reader instance
         writer: Neo4j writer instance
     """
-    # Get all file accesses for this session
-    file_accesses = reader.get_file_accesses(session_id)
-
-    if not file_accesses:
-        return
-
-    # Collect unique file paths for co-access relationship building
-    unique_file_paths = set()
+    # Collect file paths in access order for co-access relationship building
+    accessed_paths = []
+    access_records = []
 
-    for access_row in file_accesses:
+    # Stream rows straight from SQLite; sqlite3.Row supports key access
+    for access_row in reader.iter_file_accesses(session_id):
         # Create FileAccessEvent from the row data
         file_event = FileAccessEvent(
             session_id=session_id,
-            file_path=access_row.get('file_path') or '',
-            normalized_path=access_row.get('normalized_path') or '',
-            access_mode=access_row.get('access_mode') or 'read',
-            timestamp=_parse_timestamp(access_row.get('timestamp', '')),
-            tool_name=access_row.get('tool_name') or 'unknown',
-            event_id=access_row.get('event_id'),
-            project_root=access_row.get('project_root'),
-            is_primary_target=bool(access_row.get('is_primary_target', 1)),
-            is_glob_expansion=bool(access_row.get('is_glob_expansion', 0)),
+            file_path=access_row['file_path'] or '',
+            normalized_path=access_row['normalized_path'] or '',
+            access_mode=access_row['access_mode'] or 'read',
+            timestamp=_parse_timestamp(access_row['timestamp']),
+            tool_name=access_row['tool_name'] or 'unknown',
+            event_id=access_row['event_id'],
+            project_root=access_row['project_root'],
+            is_primary_target=bool(access_row['is_primary_target']),
+            is_glob_expansion=bool(access_row['is_glob_expansion']),
         )
 
         # Parse line_numbers if present (stored as JSON)
-        line_numbers_str = access_row.get('line_numbers')
+        line_numbers_str = access_row['line_numbers_json']
         if line_numbers_str:
             try:
                 file_event.line_numbers = json.loads(line_numbers_str)
@@ -318,30 +322,24 @@ def _sync_file_accesses(session_id: str, reader: CLISqliteReader,
         if not file_event.normalized_path:
             continue
 
-        # Track unique paths for co-access
-        unique_file_paths.add(file_event.normalized_path)
+        # Track access order for co-access
+        accessed_paths.append(file_event.normalized_path)
 
-        # Merge/create UnifiedFile node
-        writer.merge_unified_file(
-            file_path=file_event.normalized_path,
-            access_mode=file_event.access_mode,
-            project_root=file_event.project_root,
-        )
+        access_records.append({
+            'path': file_event.normalized_path,
+            'access_mode': file_event.access_mode,
+            'project_root': file_event.project_root,
+            'timestamp': file_event.timestamp.isoformat(),
+        })
 
-        # Create session-level access relationship
-        writer.create_session_file_access(
-            session_id=session_id,
-            file_path=file_event.normalized_path,
-            access_mode=file_event.access_mode,
-            timestamp=file_event.timestamp.isoformat(),
-        )
+    if not access_records:
+        return
 
-    # Build co-access relationships between files in this session
-    if len(unique_file_paths) > 1:
-        writer.update_co_access_relationships(session_id, list(unique_file_paths))
+    # Merge UnifiedFile nodes and session-level access relationships
+    writer.record_file_accesses_bulk(session_id, access_records)
 
-    # Mark file accesses as synced
-    reader.mark_file_accesses_synced(session_id)
+    # Build co-access relationships between files accessed close together
+    writer.update_co_access_relationships(session_id, accessed_paths)
 
 
 def _parse_timestamp(timestamp_str: str) -> datetime:
@@ -406,26 +404,24 @@ def sync_unsynced_file_accesses() -> int:
 
     try:
         with CLISqliteReader() as reader, CLINeo4jWriter() as writer:
-            unsynced = reader.get_unsynced_file_accesses()
-
-            for access_row in unsynced:
-                normalized_path = access_row.get('normalized_path')
-                if not normalized_path:
-                    continue
-
-                metadata = {
-                    'access_mode': access_row.get('access_mode') or 'read',
-                    'project_root': access_row.get('project_root'),
-                    'tool_name': access_row.get('tool_name'),
-                }
-
-                writer.merge_unified_file(normalized_path, metadata)
-                synced_count += 1
-
-            # Mark all as synced by session
-            session_ids = set(a.get('session_id') for a in unsynced if a.get('session_id'))
-            for session_id in session_ids:
-                reader.mark_file_accesses_synced(session_id)
+            session_ids = set()
+
+            for batch in reader.iter_unsynced_file_access_batches():
+                records = [
+                    {
+                        'path': row['normalized_path'],
+                        'access_mode': row['access_mode'],
+                        'project_root': row['project_root'],
+                    }
+                    for row in batch if row['normalized_path']
+                ]
+                writer.merge_unified_files_bulk(records)
+                synced_count += len(records)
+                session_ids.update(row['session_id'] for row in batch)
+
+            # Mark once paging is done: marking a session mid-way would hide
+            # its remaining rows from later pages
+            reader.mark_sessions_file_accesses_synced(session_ids)
 
     except Exception as e:
         print(f"[Hook] File access sync failed: {e}", file=sys.stderr)
@@ -4,7 +4,10 @@ Neo4j write operations for CLI hooks.
 Synchronous implementation for hook script execution.
 """
 
+import atexit
+import codecs
 import json
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
 
@@ -12,18 +15,170 @@ import sys
 
 # Add hooks root to path for imports
 HOOKS_DIR = Path(__file__).resolve().parent.parent
-sys.path.insert(0, str(HOOKS_DIR))
+if str(HOOKS_DIR) not in sys.path:
+    sys.path.insert(0, str(HOOKS_DIR))
 
 from neo4j import GraphDatabase
 
-from core.config import load_neo4j_config
+from core.config import Neo4jConfig, load_neo4j_config
 from core.models import (
     CLISessionStartEvent,
     CLISessionEndEvent,
     CLIToolResultEvent,
     CLIPromptEvent,
 )
-from core.helpers import sanitize_tool_input
+from core.helpers import compute_prompt_hash, normalize_path, sanitize_tool_input
+
+# Max UTF-8 bytes stored in CLIToolCall.outputs
+OUTPUT_MAX_BYTES = 5000
+
+# Each file is linked to at most this many distinct files accessed before it
+CO_ACCESS_WINDOW = 10
+
+# Rows per inner transaction for the File -> UnifiedFile migration
+MIGRATION_BATCH_SIZE = 10000
+
+# Path indexes the migration relies on for index seeks (name, label)
+PATH_INDEXES = (
+    ("unified_file_path", "UnifiedFile"),
+    ("file_node_path", "FileNode"),
+    ("file_path", "File"),
+)
+
+
+def _truncate_output(value, limit: int = OUTPUT_MAX_BYTES) -> str:
+    """
+    Render a tool output as a string of at most ``limit`` UTF-8 bytes.
+
+    Dicts and lists are JSON-encoded incrementally so a large response is
+    never fully materialized just to keep its first few kilobytes.
+
+    Args:
+        value: Tool output (str, bytes, dict, list or any object)
+        limit: Maximum size in UTF-8 bytes
+
+    Returns:
+        str: Truncated text (never splits a multi-byte character)
+    """
+    if value is None:
+        return ''
+    if isinstance(value, (bytes, bytearray)):
+        # Non-final decode drops a char cut at the limit; invalid bytes become U+FFFD
+        value = codecs.getincrementaldecoder('utf-8')('replace').decode(bytes(value[:limit]))
+    elif isinstance(value, (dict, list)):
+        encoder = json.JSONEncoder(default=str, ensure_ascii=False)
+        chunks = []
+        size = 0
+        try:
+            for chunk in encoder.iterencode(value):
+                chunks.append(chunk)
+                size += len(chunk)
+                if size >= limit:
+                    break
+        except (TypeError, ValueError):
+            chunks = [repr(value)[:limit]]
+        value = ''.join(chunks)
+    elif not isinstance(value, str):
+        value = str(value)
+
+    # A char is at most 4 bytes, so short strings cannot exceed the limit
+    if len(value) * 4 <= limit:
+        return value
+    return value[:limit].encode('utf-8')[:limit].decode('utf-8', 'ignore')
+
+
+# Process-wide drivers keyed by every setting passed to GraphDatabase.driver;
+# each owns a connection pool
+_DRIVERS = {}
+
+
+def get_driver(config: Neo4jConfig):
+    """
+    Return the shared Neo4j driver for a configuration, creating it once.
+
+    Writers opened in the same process reuse one driver and therefore one
+    connection pool instead of reconnecting for every writer instance.
+
+    Args:
+        config: Neo4j connection configuration
+
+    Returns:
+        neo4j.Driver: Shared driver
+    """
+    key = (
+        config.uri, config.user, config.password,
+        config.max_connection_pool_size, config.connection_timeout,
+        config.max_connection_lifetime, config.connection_acquisition_timeout,
+    )
+    driver = _DRIVERS.get(key)
+    if driver is None:
+        driver = GraphDatabase.driver(
+            config.uri,
+            auth=(config.user, config.password),
+            max_connection_pool_size=config.max_connection_pool_size,
+            connection_timeout=config.connection_timeout,
+            max_connection_lifetime=config.max_connection_lifetime,
+            connection_acquisition_timeout=config.connection_acquisition_timeout,
+        )
+        _DRIVERS[key] = driver
+    return driver
+
+
+def close_drivers():
+    """Close all shared drivers (registered to run at interpreter exit)."""
+    while _DRIVERS:
+        _, driver = _DRIVERS.popitem()
+        driver.close()
+
+
+atexit.register(close_drivers)
+
+
+def _unified_file_rows(records) -> list:
+    """Build UNWIND rows for UnifiedFile MERGEs, skipping records without a path."""
+    rows = []
+    for record in records:
+        path = record.get('path')
+        if not path:
+            continue
+        rows.append({
+            "path": path,
+            "name": path.rsplit('/', 1)[-1],
+            "extension": path.rsplit('.', 1)[-1].lower() if '.' in path else None,
+            "path_suffix": path if path.startswith('/') else '/' + path,
+            "project_root": record.get('project_root'),
+            "access_mode": record.get('access_mode') or 'read',
+            "timestamp": record.get('timestamp'),
+        })
+    return rows
+
+
+def _co_access_pairs(file_paths: list, window: int = CO_ACCESS_WINDOW) -> list:
+    """
+    Build CO_ACCESSED_WITH pairs over a sliding window of recent files.
+
+    Each path is paired with the last ``window`` distinct paths seen before
+    it, so work grows linearly with the session instead of quadratically.
+    Sessions touching ``window + 1`` files or fewer still get every pair.
+
+    Args:
+        file_paths: Paths in access order (duplicates allowed)
+        window: Number of preceding distinct files to pair with
+
+    Returns:
+        list: Sorted ``{'path1', 'path2'}`` dicts with path1 < path2
+    """
+    recent = []  # Distinct paths, most recent last
+    pairs = set()
+    for path in file_paths:
+        if path in recent:
+            recent.remove(path)
+        for prev in recent:
+            pairs.add((prev, path) if prev < path else (path, prev))
+        recent.append(path)
+        if len(recent) > window:
+            del recent[0]
+    return [{'path1': a, 'path2': b} for a, b in sorted(pairs)]
 
 
 class CLINeo4jWriter:
@@ -32,21 +187,15 @@ class CLINeo4jWriter:
     def __init__(self):
         self.config = load_neo4j_config()
         self.database = self.config.database
-        self.driver = GraphDatabase.driver(
-            self.config.uri,
-            auth=(self.config.user, self.config.password),
-            connection_timeout=5.0,
-            max_connection_lifetime=30.0,
-        )
+        self.driver = get_driver(self.config)
 
     def _with_database(self, query: str) -> str:
         """Prepend USE database statement to query."""
         return f"USE {self.database}\n{query}"
 
     def close(self):
-        """Close driver connection."""
-        if self.driver:
-            self.driver.close()
+        """Release this writer; the shared driver stays open for reuse."""
+        self.driver = None
 
     def __enter__(self):
         return self
@@ -54,6 +203,40 @@ class CLINeo4jWriter:
     def __exit__(self, exc_type, exc_val, exc_tb):
         self.close()
 
+    def _write(self, query: str, params: dict = None):
+        """Run a write query in its own managed transaction."""
+        with self.driver.session(database=self.database) as session:
+            session.execute_write(
+                lambda tx: tx.run(self._with_database(query), params or {}).consume()
+            )
+
+    def _read(self, query: str, params: dict = None) -> list:
+        """Run a read query and return its records, consumed inside the transaction."""
+        with self.driver.session(database=self.database) as session:
+            return session.execute_read(
+                lambda tx: list(tx.run(self._with_database(query), params or {}))
+            )
+
+    @contextmanager
+    def batch(self):
+        """
+        Run several write methods inside a single transaction.
+
+        Yields an object exposing the same create/merge/update methods as the
+        writer, all bound to one open transaction. The transaction commits when
+        the block exits cleanly and rolls back if it raises, so a sync pass
+        costs one Bolt commit instead of one per node.
+
+        Usage:
+            with writer.batch() as tx:
+                tx.create_tool_call_node(event)
+                tx.create_multi_file_access(...)
+        """
+        with self.driver.session(database=self.database) as session:
+            with session.begin_transaction() as tx:
+                yield _TxScope(self, tx)
+                tx.commit()
+
     def create_session_node(self, event: CLISessionStartEvent, machine_id: str = None) -> str:
         """
         Create ClaudeCodeSession node with optional Machine linking.
@@ -67,37 +250,31 @@ class CLINeo4jWriter:
         """
         session_node_id = f"cli_session:{event.session_id}"
 
-        with self.driver.session() as session:
-            session.execute_write(
-                lambda tx: tx.run(
-                    self._with_database("""
-                    MERGE (s:ClaudeCodeSession {id: $id})
-                    SET s.session_id = $session_id,
-                        s.start_time = datetime($timestamp),
-                        s.working_dir = $working_dir,
-                        s.machine_id = $machine_id,
-                        s.status = 'active',
-                        s.tool_call_count = 0,
-                        s.prompt_count = 0,
-                        s.metadata = $metadata
-
-                    // Link to Machine if machine_id provided and Machine exists
-                    WITH s
-                    OPTIONAL MATCH (m:Machine {machine_id: $machine_id})
-                    FOREACH (_ IN CASE WHEN m IS NOT NULL THEN [1] ELSE [] END |
-                        MERGE (s)-[:RAN_ON]->(m)
-                    )
-                    """),
-                    {
-                        "id": session_node_id,
-                        "session_id": event.session_id,
-                        "timestamp": event.timestamp.isoformat(),
-                        "working_dir": event.working_dir,
-                        "machine_id": machine_id,
-                        "metadata": json.dumps(event.metadata),
-                    },
-                )
+        self._write("""
+            MERGE (s:ClaudeCodeSession {id: $id})
+            SET s.session_id = $session_id,
+                s.start_time = datetime($timestamp),
+                s.working_dir = $working_dir,
+                s.machine_id = $machine_id,
+                s.status = 'active',
+                s.tool_call_count = 0,
+                s.prompt_count = 0,
+                s.metadata = $metadata
+
+            // Link to Machine if machine_id provided and Machine exists
+            WITH s
+            OPTIONAL MATCH (m:Machine {machine_id: $machine_id})
+            FOREACH (_ IN CASE WHEN m IS NOT NULL THEN [1] ELSE [] END |
+                MERGE (s)-[:RAN_ON]->(m)
             )
+            """, {
+            "id": session_node_id,
+            "session_id": event.session_id,
+            "timestamp": event.timestamp.isoformat(),
+            "working_dir": event.working_dir,
+            "machine_id": machine_id,
+            "metadata": json.dumps(event.metadata),
+        })
 
         return session_node_id
 
@@ -108,26 +285,20 @@ class CLINeo4jWriter:
         Args:
             event: Session end event data
         """
-        with self.driver.session() as session:
-            session.execute_write(
-                lambda tx: tx.run(
-                    self._with_database("""
-                    MATCH (s:ClaudeCodeSession {session_id: $session_id})
-                    SET s.end_time = datetime($timestamp),
-                        s.status = 'completed',
-                        s.total_duration_seconds = $duration,
-                        s.tool_call_count = $tool_count,
-                        s.prompt_count = $prompt_count
-                    """),
-                    {
-                        "session_id": event.session_id,
-                        "timestamp": event.timestamp.isoformat(),
-                        "duration": event.duration_seconds,
-                        "tool_count": event.tool_count,
-                        "prompt_count": event.prompt_count,
-                    },
-                )
-            )
+        self._write("""
+            MATCH (s:ClaudeCodeSession {session_id: $session_id})
+            SET s.end_time = datetime($timestamp),
+                s.status = 'completed',
+                s.total_duration_seconds = $duration,
+                s.tool_call_count = $tool_count,
+                s.prompt_count = $prompt_count
+            """, {
+            "session_id": event.session_id,
+            "timestamp": event.timestamp.isoformat(),
+            "duration": event.duration_seconds,
+            "tool_count": event.tool_count,
+            "prompt_count": event.prompt_count,
+        })
 
     def create_tool_call_node(self, event: CLIToolResultEvent):
         """
@@ -136,7 +307,8 @@ class CLINeo4jWriter:
         Args:
             event: Tool result event data
         """
-        tool_id = f"cli_tool:{event.session_id}:{event.timestamp.isoformat()}:{event.tool_name}"
+        ts_iso = event.timestamp.isoformat()
+        tool_id = f"cli_tool:{event.session_id}:{ts_iso}:{event.tool_name}"
 
         # Use file_path from event if available, otherwise extract from tool_input
         file_path = event.file_path
@@ -144,75 +316,68 @@ class CLINeo4jWriter:
             file_path = event.tool_input.get("file_path", None)
 
         # Normalize file path to Unix-style for consistency with repository mapping
-        if file_path:
-            file_path = Path(file_path).as_posix()
+        file_path = normalize_path(file_path)
 
         # Sanitize sensitive data
         sanitized_input = sanitize_tool_input(event.tool_input)
 
-        with self.driver.session() as session:
-            session.execute_write(
-                lambda tx: tx.run(
-                    self._with_database("""
-                    MATCH (s:ClaudeCodeSession {session_id: $session_id})
-                    CREATE (t:CLIToolCall {
-                        id: $id,
-                        session_id: $session_id,
-                        tool_name: $tool_name,
-                        timestamp: datetime($timestamp),
-                        inputs: $inputs,
-                        outputs: $outputs,
-                        duration_ms: $duration_ms,
-                        success: $success,
-                        error: $error,
-                        file_path: $file_path,
-                        tool_category: $tool_category,
-                        subagent_type: $subagent_type,
-                        command: $command,
-                        pattern: $pattern,
-                        url: $url,
-                        output_size_bytes: $output_size_bytes,
-                        has_stderr: $has_stderr,
-                        sequence_index: $sequence_index
-                    })
-                    CREATE (t)-[:PART_OF_SESSION]->(s)
-
-                    // Increment session tool count
-                    SET s.tool_call_count = s.tool_call_count + 1
-
-                    // Create File node and ACCESSED_FILE relationship if file_path present
-                    WITH t, $file_path as fp
-                    WHERE fp IS NOT NULL
-                    MERGE (f:File {path: fp})
-                    ON CREATE SET f.created_at = datetime(),
-                                  f.extension = CASE
-                                      WHEN fp CONTAINS '.' THEN split(fp, '.')[-1]
-                                      ELSE null
-                                  END
-                    CREATE (t)-[:ACCESSED_FILE]->(f)
-                    """),
-                    {
-                        "id": tool_id,
-                        "session_id": event.session_id,
-                        "tool_name": event.tool_name,
-                        "timestamp": event.timestamp.isoformat(),
-                        "inputs": json.dumps(sanitized_input)[:2000],  # Truncate
-                        "outputs": str(event.tool_output)[:5000],  # Truncate
-                        "duration_ms": event.duration_ms,
-                        "success": event.success,
-                        "error": event.error,
-                        "file_path": file_path,
-                        "tool_category": event.tool_category,
-                        "subagent_type": event.subagent_type,
-                        "command": event.command[:200] if event.command else None,  # Truncate
-                        "pattern": event.pattern,
-                        "url": event.url,
-                        "output_size_bytes": event.output_size_bytes,
-                        "has_stderr": event.has_stderr,
-                        "sequence_index": event.sequence_index,
-                    },
-                )
-            )
+        self._write("""
+            MATCH (s:ClaudeCodeSession {session_id: $session_id})
+            CREATE (t:CLIToolCall {
+                id: $id,
+                session_id: $session_id,
+                tool_name: $tool_name,
+                timestamp: datetime($timestamp),
+                inputs: $inputs,
+                outputs: $outputs,
+                duration_ms: $duration_ms,
+                success: $success,
+                error: $error,
+                file_path: $file_path,
+                tool_category: $tool_category,
+                subagent_type: $subagent_type,
+                command: $command,
+                pattern: $pattern,
+                url: $url,
+                output_size_bytes: $output_size_bytes,
+                has_stderr: $has_stderr,
+                sequence_index: $sequence_index
+            })
+            CREATE (t)-[:PART_OF_SESSION]->(s)
+
+            // Increment session tool count
+            SET s.tool_call_count = s.tool_call_count + 1
+
+            // Create File node and ACCESSED_FILE relationship if file_path present
+            WITH t, $file_path as fp
+            WHERE fp IS NOT NULL
+            MERGE (f:File {path: fp})
+            ON CREATE SET f.created_at = datetime(),
+                          f.extension = CASE
+                              WHEN fp CONTAINS '.' THEN split(fp, '.')[-1]
+                              ELSE null
+                          END
+            CREATE (t)-[:ACCESSED_FILE]->(f)
+            """, {
+            "id": tool_id,
+            "session_id": event.session_id,
+            "tool_name": event.tool_name,
+            "timestamp": ts_iso,
+            "inputs": json.dumps(sanitized_input)[:2000],  # Truncate
+            "outputs": _truncate_output(event.tool_output),
+            "duration_ms": event.duration_ms,
+            "success": event.success,
+            "error": event.error,
+            "file_path": file_path,
+            "tool_category": event.tool_category,
+            "subagent_type": event.subagent_type,
+            "command": event.command[:200] if event.command else None,  # Truncate
+            "pattern": event.pattern,
+            "url": event.url,
+            "output_size_bytes": event.output_size_bytes,
+            "has_stderr": event.has_stderr,
+            "sequence_index": event.sequence_index,
+        })
 
     def create_prompt_node(self, event: CLIPromptEvent):
         """
@@ -221,43 +386,36 @@ class CLINeo4jWriter:
         Args:
             event: Prompt event data
         """
-        import hashlib
-
-        prompt_hash = hashlib.sha256(event.prompt_text.encode()).hexdigest()
-        prompt_id = f"cli_prompt:{event.session_id}:{event.timestamp.isoformat()}"
-
-        with self.driver.session() as session:
-            session.execute_write(
-                lambda tx: tx.run(
-                    self._with_database("""
-                    MATCH (s:ClaudeCodeSession {session_id: $session_id})
-                    CREATE (p:CLIPrompt {
-                        id: $id,
-                        session_id: $session_id,
-                        prompt_text: $prompt_text,
-                        full_prompt_hash: $hash,
-                        timestamp: datetime($timestamp),
-                        prompt_length: $length,
-                        intent_type: $intent_type,
-                        sequence_index: $sequence_index
-                    })
-                    CREATE (p)-[:PART_OF_SESSION]->(s)
-
-                    // Increment session prompt count
-                    SET s.prompt_count = s.prompt_count + 1
-                    """),
-                    {
-                        "id": prompt_id,
-                        "session_id": event.session_id,
-                        "prompt_text": event.prompt_text[:1000],  # Truncate
-                        "hash": prompt_hash,
-                        "timestamp": event.timestamp.isoformat(),
-                        "length": len(event.prompt_text),
-                        "intent_type": event.intent_type,
-                        "sequence_index": event.sequence_index,
-                    },
-                )
-            )
+        prompt_hash = compute_prompt_hash(event.prompt_text)
+        ts_iso = event.timestamp.isoformat()
+        prompt_id = f"cli_prompt:{event.session_id}:{ts_iso}"
+
+        self._write("""
+            MATCH (s:ClaudeCodeSession {session_id: $session_id})
+            CREATE (p:CLIPrompt {
+                id: $id,
+                session_id: $session_id,
+                prompt_text: $prompt_text,
+                full_prompt_hash: $hash,
+                timestamp: datetime($timestamp),
+                prompt_length: $length,
+                intent_type: $intent_type,
+                sequence_index: $sequence_index
+            })
+            CREATE (p)-[:PART_OF_SESSION]->(s)
+
+            // Increment session prompt count
+            SET s.prompt_count = s.prompt_count + 1
+            """, {
+            "id": prompt_id,
+            "session_id": event.session_id,
+            "prompt_text": event.prompt_text[:1000],  # Truncate
+            "hash": prompt_hash,
+            "timestamp": ts_iso,
+            "length": len(event.prompt_text),
+            "intent_type": event.intent_type,
+            "sequence_index": event.sequence_index,
+        })
 
     def create_metrics_summary(self, session_id: str):
         """
@@ -266,90 +424,70 @@ class CLINeo4jWriter:
         Args:
             session_id: Session identifier
         """
-        with self.driver.session() as session:
-            # Query tool usage - consume results inside transaction
-            def query_tool_usage(tx):
-                result = tx.run(
-                    self._with_database("""
-                    MATCH (t:CLIToolCall)-[:PART_OF_SESSION]->(s:ClaudeCodeSession {session_id: $session_id})
-                    RETURN
-                        t.tool_name as tool,
-                        count(*) as count,
-                        avg(t.duration_ms) as avg_duration
-                    ORDER BY count DESC
-                    """),
-                    {"session_id": session_id},
-                )
-                return list(result)  # Consume immediately
-
-            tool_records = session.execute_read(query_tool_usage)
-
-            tool_usage = {}
-            total_duration = 0
-            total_count = 0
-            most_used_tool = None
-
-            for record in tool_records:
-                tool = record["tool"]
-                count = record["count"]
-                avg_dur = record["avg_duration"] or 0
-
-                tool_usage[tool] = count
-                total_duration += avg_dur * count
-                total_count += count
-
-                if most_used_tool is None:
-                    most_used_tool = tool
-
-            avg_duration = total_duration / total_count if total_count > 0 else 0
-
-            # Get prompt count from session - consume results inside transaction
-            def query_session_counts(tx):
-                result = tx.run(
-                    self._with_database("""
-                    MATCH (s:ClaudeCodeSession {session_id: $session_id})
-                    RETURN s.prompt_count as prompt_count, s.tool_call_count as tool_count
-                    """),
-                    {"session_id": session_id},
-                )
-                return list(result)  # Consume immediately
-
-            count_records = session.execute_read(query_session_counts)
-
-            prompt_count = 0
-            tool_count = 0
-            for record in count_records:
-                prompt_count = record["prompt_count"]
-                tool_count = record["tool_count"]
-
-            # Create metrics node
-            session.execute_write(
-                lambda tx: tx.run(
-                    self._with_database("""
-                    MATCH (s:ClaudeCodeSession {session_id: $session_id})
-                    CREATE (m:CLIMetrics {
-                        id: $id,
-                        session_id: $session_id,
-                        tool_usage_summary: $tool_usage,
-                        most_used_tool: $most_used_tool,
-                        avg_tool_duration_ms: $avg_duration,
-                        total_prompts: $total_prompts,
-                        total_tools: $total_tools,
-                        calculated_at: datetime()
-                    })
-                    CREATE (m)-[:SUMMARIZES]->(s)
-                    """),
-                    {
-                        "id": f"cli_metrics:{session_id}",
-                        "session_id": session_id,
-                        "tool_usage": json.dumps(tool_usage),
-                        "most_used_tool": most_used_tool,
-                        "avg_duration": avg_duration,
-                        "total_prompts": prompt_count,
-                        "total_tools": tool_count,
-                    },
-                )
-            )
+        # Query tool usage
+        tool_records = self._read("""
+            MATCH (t:CLIToolCall)-[:PART_OF_SESSION]->(s:ClaudeCodeSession {session_id: $session_id})
+            RETURN
+                t.tool_name as tool,
+                count(*) as count,
+                avg(t.duration_ms) as avg_duration
+            ORDER BY count DESC
+            """, {"session_id": session_id})
+
+        tool_usage = {}
+        total_duration = 0
+        total_count = 0
+        most_used_tool = None
+
+        for record in tool_records:
+            tool = record["tool"]
+            count = record["count"]
+            avg_dur = record["avg_duration"] or 0
+
+            tool_usage[tool] = count
+            total_duration += avg_dur * count
+            total_count += count
+
+            if most_used_tool is None:
+                most_used_tool = tool
+
+        avg_duration = total_duration / total_count if total_count > 0 else 0
+
+        # Get prompt count from session
+        count_records = self._read("""
+            MATCH (s:ClaudeCodeSession {session_id: $session_id})
+            RETURN s.prompt_count as prompt_count, s.tool_call_count as tool_count
+            """, {"session_id": session_id})
+
+        prompt_count = 0
+        tool_count = 0
+        for record in count_records:
+            prompt_count = record["prompt_count"]
+            tool_count = record["tool_count"]
+
+        # Create metrics node
+        self._write("""
+            MATCH (s:ClaudeCodeSession {session_id: $session_id})
+            CREATE (m:CLIMetrics {
+                id: $id,
+                session_id: $session_id,
+                tool_usage_summary: $tool_usage,
+                most_used_tool: $most_used_tool,
+                avg_tool_duration_ms: $avg_duration,
+                total_prompts: $total_prompts,
+                total_tools: $total_tools,
+                calculated_at: datetime()
+            })
+            CREATE (m)-[:SUMMARIZES]->(s)
+            """, {
+            "id": f"cli_metrics:{session_id}",
+            "session_id": session_id,
+            "tool_usage": json.dumps(tool_usage),
+            "most_used_tool": most_used_tool,
+            "avg_duration": avg_duration,
+            "total_prompts": prompt_count,
+            "total_tools": tool_count,
+        })
 
     # -------------------------------------------------------------------------
     # Subagent Methods
@@ -371,31 +509,25 @@ class CLINeo4jWriter:
         """
         subagent_node_id = f"cli_subagent:{agent_id}"
 
-        with self.driver.session() as session:
-            session.execute_write(
-                lambda tx: tx.run(
-                    self._with_database("""
-                    MATCH (parent:ClaudeCodeSession {session_id: $parent_session_id})
-                    MERGE (sub:SubagentSession {id: $id})
-                    SET sub.agent_id = $agent_id,
-                        sub.parent_session_id = $parent_session_id,
-                        sub.subagent_type = $subagent_type,
-                        sub.transcript_path = $transcript_path,
-                        sub.tool_count = $tool_count,
-                        sub.end_time = datetime($timestamp)
-                    MERGE (sub)-[:CHILD_OF_SESSION]->(parent)
-                    """),
-                    {
-                        "id": subagent_node_id,
-                        "agent_id": agent_id,
-                        "parent_session_id": parent_session_id,
-                        "subagent_type": subagent_type,
-                        "transcript_path": transcript_path,
-                        "tool_count": tool_count,
-                        "timestamp": timestamp.isoformat(),
-                    },
-                )
-            )
+        self._write("""
+            MATCH (parent:ClaudeCodeSession {session_id: $parent_session_id})
+            MERGE (sub:SubagentSession {id: $id})
+            SET sub.agent_id = $agent_id,
+                sub.parent_session_id = $parent_session_id,
+                sub.subagent_type = $subagent_type,
+                sub.transcript_path = $transcript_path,
+                sub.tool_count = $tool_count,
+                sub.end_time = datetime($timestamp)
+            MERGE (sub)-[:CHILD_OF_SESSION]->(parent)
+            """, {
+            "id": subagent_node_id,
+            "agent_id": agent_id,
+            "parent_session_id": parent_session_id,
+            "subagent_type": subagent_type,
+            "transcript_path": transcript_path,
+            "tool_count": tool_count,
+            "timestamp": timestamp.isoformat(),
+        })
 
     def create_subagent_tool_call(self, parent_session_id: str, agent_id: str,
                                    tool_data: dict, subagent_type: str = None):
@@ -409,63 +541,55 @@ class CLINeo4jWriter:
             subagent_type: Type of subagent
         """
         tool_name = tool_data.get('tool_name', 'unknown')
-        timestamp = tool_data.get('timestamp', datetime.now().isoformat())
+        timestamp = tool_data.get('timestamp') or datetime.now().isoformat()
         tool_id = f"cli_subtool:{agent_id}:{timestamp}:{tool_name}"
 
         # Extract and normalize file_path
         tool_input = tool_data.get('tool_input') or {}
-        file_path = tool_input.get('file_path')
-        if file_path:
-            file_path = Path(file_path).as_posix()
+        file_path = normalize_path(tool_input.get('file_path'))
 
         # Sanitize input
         sanitized_input = sanitize_tool_input(tool_input)
 
-        with self.driver.session() as session:
-            session.execute_write(
-                lambda tx: tx.run(
-                    self._with_database("""
-                    MATCH (sub:SubagentSession {agent_id: $agent_id})
-                    CREATE (t:CLIToolCall {
-                        id: $id,
-                        session_id: $agent_id,
-                        parent_session_id: $parent_session_id,
-                        is_subagent_tool: true,
-                        tool_name: $tool_name,
-                        timestamp: datetime($timestamp),
-                        inputs: $inputs,
-                        outputs: $outputs,
-                        success: $success,
-                        file_path: $file_path,
-                        subagent_type: $subagent_type
-                    })
-                    CREATE (t)-[:PART_OF_SUBAGENT]->(sub)
-
-                    // Create File node and ACCESSED_FILE relationship if file_path present
-                    WITH t, $file_path as fp
-                    WHERE fp IS NOT NULL
-                    MERGE (f:File {path: fp})
-                    ON CREATE SET f.created_at = datetime(),
-                                  f.extension = CASE
-                                      WHEN fp CONTAINS '.' THEN split(fp, '.')[-1]
-                                      ELSE null
-                                  END
-                    CREATE (t)-[:ACCESSED_FILE]->(f)
-                    """),
-                    {
-                        "id": tool_id,
-                        "agent_id": agent_id,
-                        "parent_session_id": parent_session_id,
-                        "tool_name": tool_name,
-                        "timestamp": timestamp,
-                        "inputs": json.dumps(sanitized_input)[:2000],
-                        "outputs": str(tool_data.get('tool_result', ''))[:5000],
-                        "success": tool_data.get('success', True),
-                        "file_path": file_path,
-                        "subagent_type": subagent_type,
-                    },
-                )
-            )
+        self._write("""
+            MATCH (sub:SubagentSession {agent_id: $agent_id})
+            CREATE (t:CLIToolCall {
+                id: $id,
+                session_id: $agent_id,
+                parent_session_id: $parent_session_id,
+                is_subagent_tool: true,
+                tool_name: $tool_name,
+                timestamp: datetime($timestamp),
+                inputs: $inputs,
+                outputs: $outputs,
+                success: $success,
+                file_path: $file_path,
+                subagent_type: $subagent_type
+            })
+            CREATE (t)-[:PART_OF_SUBAGENT]->(sub)
+
+            // Create File node and ACCESSED_FILE relationship if file_path present
+            WITH t, $file_path as fp
+            WHERE fp IS NOT NULL
+            MERGE (f:File {path: fp})
+            ON CREATE SET f.created_at = datetime(),
+                          f.extension = CASE
+                              WHEN fp CONTAINS '.' THEN split(fp, '.')[-1]
+                              ELSE null
+                          END
+            CREATE (t)-[:ACCESSED_FILE]->(f)
+            """, {
+            "id": tool_id,
+            "agent_id": agent_id,
+            "parent_session_id": parent_session_id,
+            "tool_name": tool_name,
+            "timestamp": timestamp,
+            "inputs": json.dumps(sanitized_input)[:2000],
+            "outputs": _truncate_output(tool_data.get('tool_result')),
+            "success": tool_data.get('success', True),
+            "file_path": file_path,
+            "subagent_type": subagent_type,
+        })
 
     def link_task_to_subagent(self, task_tool_use_id: str, agent_id: str):
         """
@@ -475,21 +599,15 @@ class CLINeo4jWriter:
             task_tool_use_id: The tool_use_id of the Task tool call
             agent_id: The subagent's session ID
         """
-        with self.driver.session() as session:
-            session.execute_write(
-                lambda tx: tx.run(
-                    self._with_database("""
-                    MATCH (task:CLIToolCall)
-                    WHERE task.tool_name = 'Task' AND task.id CONTAINS $task_id
-                    MATCH (sub:SubagentSession {agent_id: $agent_id})
-                    MERGE (task)-[:TRIGGERED_SUBAGENT]->(sub)
-                    """),
-                    {
-                        "task_id": task_tool_use_id,
-                        "agent_id": agent_id,
-                    },
-                )
-            )
+        self._write("""
+            MATCH (task:CLIToolCall)
+            WHERE task.tool_name = 'Task' AND task.id CONTAINS $task_id
+            MATCH (sub:SubagentSession {agent_id: $agent_id})
+            MERGE (task)-[:TRIGGERED_SUBAGENT]->(sub)
+            """, {
+            "task_id": task_tool_use_id,
+            "agent_id": agent_id,
+        })
 
     # -------------------------------------------------------------------------
     # Unified File Model Methods (v7)
@@ -518,54 +636,48 @@ class CLINeo4jWriter:
 
         file_id = f"unified_file:{file_path}"
 
-        with self.driver.session() as session:
-            session.execute_write(
-                lambda tx: tx.run(
-                    self._with_database("""
-                    MERGE (uf:UnifiedFile {path: $path})
-                    ON CREATE SET
-                        uf.id = $id,
-                        uf.name = $name,
-                        uf.extension = $extension,
-                        uf.project_path = $project_root,
-                        uf.read_count = CASE WHEN $access_mode = 'read' THEN 1 ELSE 0 END,
-                        uf.write_count = CASE WHEN $access_mode = 'write' THEN 1 ELSE 0 END,
-                        uf.modify_count = CASE WHEN $access_mode = 'modify' THEN 1 ELSE 0 END,
-                        uf.search_count = CASE WHEN $access_mode = 'search' THEN 1 ELSE 0 END,
-                        uf.first_accessed = datetime(),
-                        uf.last_accessed = datetime(),
-                        uf.created_at = datetime()
-                    ON MATCH SET
-                        uf.read_count = uf.read_count + CASE WHEN $access_mode = 'read' THEN 1 ELSE 0 END,
-                        uf.write_count = uf.write_count + CASE WHEN $access_mode = 'write' THEN 1 ELSE 0 END,
-                        uf.modify_count = uf.modify_count + CASE WHEN $access_mode = 'modify' THEN 1 ELSE 0 END,
-                        uf.search_count = uf.search_count + CASE WHEN $access_mode = 'search' THEN 1 ELSE 0 END,
-                        uf.last_accessed = datetime(),
-                        uf.updated_at = datetime()
-
-                    // Link to FileNode if exists (by path match)
-                    WITH uf
-                    OPTIONAL MATCH (fn:FileNode)
-                    WHERE fn.path = $path OR fn.path ENDS WITH $path_suffix
-                    WITH uf, fn
-                    WHERE fn IS NOT NULL
-                    MERGE (uf)-[:MERGED_FROM]->(fn)
-                    SET uf.content_hash = fn.content_hash,
-                        uf.size_bytes = fn.size_bytes,
-                        uf.mime_type = fn.mime_type,
-                        uf.scanned_at = fn.created_at
-                    """),
-                    {
-                        "id": file_id,
-                        "path": file_path,
-                        "name": file_path.rsplit('/', 1)[-1] if '/' in file_path else file_path,
-                        "extension": extension,
-                        "project_root": project_root,
-                        "access_mode": access_mode,
-                        "path_suffix": '/' + file_path if not file_path.startswith('/') else file_path,
-                    },
-                )
-            )
+        self._write("""
+            MERGE (uf:UnifiedFile {path: $path})
+            ON CREATE SET
+                uf.id = $id,
+                uf.name = $name,
+                uf.extension = $extension,
+                uf.project_path = $project_root,
+                uf.read_count = CASE WHEN $access_mode = 'read' THEN 1 ELSE 0 END,
+                uf.write_count = CASE WHEN $access_mode = 'write' THEN 1 ELSE 0 END,
+                uf.modify_count = CASE WHEN $access_mode = 'modify' THEN 1 ELSE 0 END,
+                uf.search_count = CASE WHEN $access_mode = 'search' THEN 1 ELSE 0 END,
+                uf.first_accessed = datetime(),
+                uf.last_accessed = datetime(),
+                uf.created_at = datetime()
+            ON MATCH SET
+                uf.read_count = uf.read_count + CASE WHEN $access_mode = 'read' THEN 1 ELSE 0 END,
+                uf.write_count = uf.write_count + CASE WHEN $access_mode = 'write' THEN 1 ELSE 0 END,
+                uf.modify_count = uf.modify_count + CASE WHEN $access_mode = 'modify' THEN 1 ELSE 0 END,
+                uf.search_count = uf.search_count + CASE WHEN $access_mode = 'search' THEN 1 ELSE 0 END,
+                uf.last_accessed = datetime(),
+                uf.updated_at = datetime()
+
+            // Link to FileNode if exists (by path match)
+            WITH uf
+            OPTIONAL MATCH (fn:FileNode)
+            WHERE fn.path = $path OR fn.path ENDS WITH $path_suffix
+            WITH uf, fn
+            WHERE fn IS NOT NULL
+            MERGE (uf)-[:MERGED_FROM]->(fn)
+            SET uf.content_hash = fn.content_hash,
+                uf.size_bytes = fn.size_bytes,
+                uf.mime_type = fn.mime_type,
+                uf.scanned_at = fn.created_at
+            """, {
+            "id": file_id,
+            "path": file_path,
+            "name": file_path.rsplit('/', 1)[-1] if '/' in file_path else file_path,
+            "extension": extension,
+            "project_root": project_root,
+            "access_mode": access_mode,
+            "path_suffix": '/' + file_path if not file_path.startswith('/') else file_path,
+        })
 
         return file_id
 
@@ -586,100 +698,84 @@ class CLINeo4jWriter:
         if not file_paths:
             return
 
-        with self.driver.session() as session:
-            for i, file_path in enumerate(file_paths):
-                is_primary = (i == 0)  # First file is primary
-                session.execute_write(
-                    lambda tx, fp=file_path, primary=is_primary: tx.run(
-                        self._with_database("""
-                        // Create/update UnifiedFile
-                        MERGE (uf:UnifiedFile {path: $path})
-                        ON CREATE SET
-                            uf.id = 'unified_file:' + $path,
-                            uf.name = CASE WHEN $path CONTAINS '/'
-                                THEN split($path, '/')[-1]
-                                ELSE $path END,
-                            uf.extension = CASE WHEN $path CONTAINS '.'
-                                THEN split($path, '.')[-1]
-                                ELSE null END,
-                            uf.project_path = $project_root,
-                            uf.read_count = CASE WHEN $access_mode = 'read' THEN 1 ELSE 0 END,
-                            uf.write_count = CASE WHEN $access_mode = 'write' THEN 1 ELSE 0 END,
-                            uf.modify_count = CASE WHEN $access_mode = 'modify' THEN 1 ELSE 0 END,
-                            uf.search_count = CASE WHEN $access_mode = 'search' THEN 1 ELSE 0 END,
-                            uf.first_accessed = datetime(),
-                            uf.last_accessed = datetime(),
-                            uf.created_at = datetime()
-                        ON MATCH SET
-                            uf.read_count = uf.read_count + CASE WHEN $access_mode = 'read' THEN 1 ELSE 0 END,
-                            uf.write_count = uf.write_count + CASE WHEN $access_mode = 'write' THEN 1 ELSE 0 END,
-                            uf.modify_count = uf.modify_count + CASE WHEN $access_mode = 'modify' THEN 1 ELSE 0 END,
-                            uf.search_count = uf.search_count + CASE WHEN $access_mode = 'search' THEN 1 ELSE 0 END,
-                            uf.last_accessed = datetime()
-
-                        // Link to CLIToolCall
-                        WITH uf
-                        MATCH (t:CLIToolCall {id: $tool_call_id})
-                        CREATE (t)-[:ACCESSED_FILE {
-                            access_mode: $access_mode,
-                            is_primary: $is_primary,
-                            is_glob_expansion: $is_glob
-                        }]->(uf)
-                        """),
-                        {
-                            "path": fp,
-                            "tool_call_id": tool_call_id,
-                            "access_mode": access_mode,
-                            "project_root": project_root,
-                            "is_primary": primary,
-                            "is_glob": is_glob_expansion,
-                        },
-                    )
-                )
-
-    def update_co_access_relationships(self, session_id: str, file_paths: list):
+        for i, file_path in enumerate(file_paths):
+            self._write("""
+            // Create/update UnifiedFile
+            MERGE (uf:UnifiedFile {path: $path})
+            ON CREATE SET
+                uf.id = 'unified_file:' + $path,
+                uf.name = CASE WHEN $path CONTAINS '/'
+                    THEN split($path, '/')[-1]
+                    ELSE $path END,
+                uf.extension = CASE WHEN $path CONTAINS '.'
+                    THEN split($path, '.')[-1]
+                    ELSE null END,
+                uf.project_path = $project_root,
+                uf.read_count = CASE WHEN $access_mode = 'read' THEN 1 ELSE 0 END,
+                uf.write_count = CASE WHEN $access_mode = 'write' THEN 1 ELSE 0 END,
+                uf.modify_count = CASE WHEN $access_mode = 'modify' THEN 1 ELSE 0 END,
+                uf.search_count = CASE WHEN $access_mode = 'search' THEN 1 ELSE 0 END,
+                uf.first_accessed = datetime(),
+                uf.last_accessed = datetime(),
+                uf.created_at = datetime()
+            ON MATCH SET
+                uf.read_count = uf.read_count + CASE WHEN $access_mode = 'read' THEN 1 ELSE 0 END,
+                uf.write_count = uf.write_count + CASE WHEN $access_mode = 'write' THEN 1 ELSE 0 END,
+                uf.modify_count = uf.modify_count + CASE WHEN $access_mode = 'modify' THEN 1 ELSE 0 END,
+                uf.search_count = uf.search_count + CASE WHEN $access_mode = 'search' THEN 1 ELSE 0 END,
+                uf.last_accessed = datetime()
+
+            // Link to CLIToolCall
+            WITH uf
+            MATCH (t:CLIToolCall {id: $tool_call_id})
+            CREATE (t)-[:ACCESSED_FILE {
+                access_mode: $access_mode,
+                is_primary: $is_primary,
+                is_glob_expansion: $is_glob
+            }]->(uf)
+            """, {
+                "path": file_path,
+                "tool_call_id": tool_call_id,
+                "access_mode": access_mode,
+                "project_root": project_root,
+                "is_primary": i == 0,  # First file is primary
+                "is_glob": is_glob_expansion,
+            })
+
+    def update_co_access_relationships(self, session_id: str, file_paths: list,
+                                       window: int = CO_ACCESS_WINDOW):
         """
         Update CO_ACCESSED_WITH relationships for files in same session.
 
-        Creates or increments co-access count between all pairs of files
-        that were accessed in the same session.
+        Creates or increments co-access count between each file and the
+        files accessed shortly before it (see _co_access_pairs).
 
         Args:
             session_id: The session identifier
-            file_paths: List of file paths accessed in this session
+            file_paths: File paths accessed in this session, in access order
+            window: Number of preceding distinct files to link each file to
         """
         if not file_paths or len(file_paths) < 2:
             return
 
-        # Get unique paths
-        unique_paths = list(set(file_paths))
-        if len(unique_paths) < 2:
+        pairs = _co_access_pairs(file_paths, window)
+        if not pairs:
             return
 
-        with self.driver.session() as session:
-            # Create/update co-access relationships for all pairs
-            session.execute_write(
-                lambda tx: tx.run(
-                    self._with_database("""
-                    UNWIND $paths as path1
-                    UNWIND $paths as path2
-                    WITH path1, path2
-                    WHERE path1 < path2  // Avoid duplicates and self-links
-                    MATCH (f1:UnifiedFile {path: path1})
-                    MATCH (f2:UnifiedFile {path: path2})
-                    MERGE (f1)-[r:CO_ACCESSED_WITH]-(f2)
-                    ON CREATE SET
-                        r.co_access_count = 1,
-                        r.session_count = 1,
-                        r.created_at = datetime(),
-                        r.updated_at = datetime()
-                    ON MATCH SET
-                        r.co_access_count = r.co_access_count + 1,
-                        r.updated_at = datetime()
-                    """),
-                    {"paths": unique_paths},
-                )
-            )
+        self._write("""
+            UNWIND $pairs as pair
+            MATCH (f1:UnifiedFile {path: pair.path1})
+            MATCH (f2:UnifiedFile {path: pair.path2})
+            MERGE (f1)-[r:CO_ACCESSED_WITH]-(f2)
+            ON CREATE SET
+                r.co_access_count = 1,
+                r.session_count = 1,
+                r.created_at = datetime(),
+                r.updated_at = datetime()
+            ON MATCH SET
+                r.co_access_count = r.co_access_count + 1,
+                r.updated_at = datetime()
+            """, {"pairs": pairs})
 
     def create_session_file_access(self, session_id: str, file_path: str,
                                     access_mode: str, timestamp: str):
@@ -692,44 +788,180 @@ class CLINeo4jWriter:
             access_mode: Access type
             timestamp: ISO format timestamp
         """
-        with self.driver.session() as session:
-            session.execute_write(
-                lambda tx: tx.run(
-                    self._with_database("""
-                    MATCH (s:ClaudeCodeSession {session_id: $session_id})
-                    MERGE (uf:UnifiedFile {path: $path})
-                    ON CREATE SET
-                        uf.id = 'unified_file:' + $path,
-                        uf.created_at = datetime()
-                    MERGE (s)-[r:SESSION_ACCESSED]->(uf)
-                    ON CREATE SET
-                        r.first_access = datetime($timestamp),
-                        r.last_access = datetime($timestamp),
-                        r.read_count = CASE WHEN $access_mode = 'read' THEN 1 ELSE 0 END,
-                        r.write_count = CASE WHEN $access_mode = 'write' THEN 1 ELSE 0 END
-                    ON MATCH SET
-                        r.last_access = datetime($timestamp),
-                        r.read_count = r.read_count + CASE WHEN $access_mode = 'read' THEN 1 ELSE 0 END,
-                        r.write_count = r.write_count + CASE WHEN $access_mode = 'write' THEN 1 ELSE 0 END
-                    """),
-                    {
-                        "session_id": session_id,
-                        "path": file_path,
-                        "access_mode": access_mode,
-                        "timestamp": timestamp,
-                    },
-                )
-            )
+        self._write("""
+            MATCH (s:ClaudeCodeSession {session_id: $session_id})
+            MERGE (uf:UnifiedFile {path: $path})
+            ON CREATE SET
+                uf.id = 'unified_file:' + $path,
+                uf.created_at = datetime()
+            MERGE (s)-[r:SESSION_ACCESSED]->(uf)
+            ON CREATE SET
+                r.first_access = datetime($timestamp),
+                r.last_access = datetime($timestamp),
+                r.read_count = CASE WHEN $access_mode = 'read' THEN 1 ELSE 0 END,
+                r.write_count = CASE WHEN $access_mode = 'write' THEN 1 ELSE 0 END
+            ON MATCH SET
+                r.last_access = datetime($timestamp),
+                r.read_count = r.read_count + CASE WHEN $access_mode = 'read' THEN 1 ELSE 0 END,
+                r.write_count = r.write_count + CASE WHEN $access_mode = 'write' THEN 1 ELSE 0 END
+            """, {
+            "session_id": session_id,
+            "path": file_path,
+            "access_mode": access_mode,
+            "timestamp": timestamp,
+        })
+
+    def merge_unified_files_bulk(self, records: list):
+        """
+        MERGE UnifiedFile nodes for a batch of file accesses in one UNWIND query.
+
+        Equivalent to calling merge_unified_file() for each record.
+
+        Args:
+            records: Dicts with path, access_mode and optional project_root
+        """
+        rows = _unified_file_rows(records)
+        if not rows:
+            return
 
-    def migrate_file_to_unified(self) -> dict:
+        self._write("""
+            UNWIND $rows as r
+            MERGE (uf:UnifiedFile {path: r.path})
+            ON CREATE SET
+                uf.id = 'unified_file:' + r.path,
+                uf.name = r.name,
+                uf.extension = r.extension,
+                uf.project_path = r.project_root,
+                uf.read_count = CASE WHEN r.access_mode = 'read' THEN 1 ELSE 0 END,
+                uf.write_count = CASE WHEN r.access_mode = 'write' THEN 1 ELSE 0 END,
+                uf.modify_count = CASE WHEN r.access_mode = 'modify' THEN 1 ELSE 0 END,
+                uf.search_count = CASE WHEN r.access_mode = 'search' THEN 1 ELSE 0 END,
+                uf.first_accessed = datetime(),
+                uf.last_accessed = datetime(),
+                uf.created_at = datetime()
+            ON MATCH SET
+                uf.read_count = uf.read_count + CASE WHEN r.access_mode = 'read' THEN 1 ELSE 0 END,
+                uf.write_count = uf.write_count + CASE WHEN r.access_mode = 'write' THEN 1 ELSE 0 END,
+                uf.modify_count = uf.modify_count + CASE WHEN r.access_mode = 'modify' THEN 1 ELSE 0 END,
+                uf.search_count = uf.search_count + CASE WHEN r.access_mode = 'search' THEN 1 ELSE 0 END,
+                uf.last_accessed = datetime(),
+                uf.updated_at = datetime()
+
+            // Link each distinct file to FileNode if exists (by path match)
+            WITH DISTINCT uf, r.path_suffix as path_suffix
+            OPTIONAL MATCH (fn:FileNode)
+            WHERE fn.path = uf.path OR fn.path ENDS WITH path_suffix
+            WITH uf, fn
+            WHERE fn IS NOT NULL
+            MERGE (uf)-[:MERGED_FROM]->(fn)
+            SET uf.content_hash = fn.content_hash,
+                uf.size_bytes = fn.size_bytes,
+                uf.mime_type = fn.mime_type,
+                uf.scanned_at = fn.created_at
+            """, {"rows": rows})
+
+    def record_file_accesses_bulk(self, session_id: str, records: list):
+        """
+        Record all file accesses of a session in one UNWIND query.
+
+        Equivalent to calling merge_unified_file() and
+        create_session_file_access() for each record, but in a single round
+        trip instead of two per access.
+
+        Args:
+            session_id: The session identifier
+            records: Dicts with path, access_mode, timestamp (ISO format)
+                and optional project_root, in access order
+        """
+        rows = _unified_file_rows(records)
+        if not rows:
+            return
+
+        self._write("""
+            MATCH (s:ClaudeCodeSession {session_id: $session_id})
+            UNWIND $rows as r
+            MERGE (uf:UnifiedFile {path: r.path})
+            ON CREATE SET
+                uf.id = 'unified_file:' + r.path,
+                uf.name = r.name,
+                uf.extension = r.extension,
+                uf.project_path = r.project_root,
+                uf.read_count = CASE WHEN r.access_mode = 'read' THEN 1 ELSE 0 END,
+                uf.write_count = CASE WHEN r.access_mode = 'write' THEN 1 ELSE 0 END,
+                uf.modify_count = CASE WHEN r.access_mode = 'modify' THEN 1 ELSE 0 END,
+                uf.search_count = CASE WHEN r.access_mode = 'search' THEN 1 ELSE 0 END,
+                uf.first_accessed = datetime(),
+                uf.last_accessed = datetime(),
+                uf.created_at = datetime()
+            ON MATCH SET
+                uf.read_count = uf.read_count + CASE WHEN r.access_mode = 'read' THEN 1 ELSE 0 END,
+                uf.write_count = uf.write_count + CASE WHEN r.access_mode = 'write' THEN 1 ELSE 0 END,
+                uf.modify_count = uf.modify_count + CASE WHEN r.access_mode = 'modify' THEN 1 ELSE 0 END,
+                uf.search_count = uf.search_count + CASE WHEN r.access_mode = 'search' THEN 1 ELSE 0 END,
+                uf.last_accessed = datetime(),
+                uf.updated_at = datetime()
+
+            // Session-level access relationship
+            MERGE (s)-[rel:SESSION_ACCESSED]->(uf)
+            ON CREATE SET
+                rel.first_access = datetime(r.timestamp),
+                rel.last_access = datetime(r.timestamp),
+                rel.read_count = CASE WHEN r.access_mode = 'read' THEN 1 ELSE 0 END,
+                rel.write_count = CASE WHEN r.access_mode = 'write' THEN 1 ELSE 0 END
+            ON MATCH SET
+                rel.last_access = datetime(r.timestamp),
+                rel.read_count = rel.read_count + CASE WHEN r.access_mode = 'read' THEN 1 ELSE 0 END,
+                rel.write_count = rel.write_count + CASE WHEN r.access_mode = 'write' THEN 1 ELSE 0 END
+
+            // Link each distinct file to FileNode if exists (by path match)
+            WITH DISTINCT uf, r.path_suffix as path_suffix
+            OPTIONAL MATCH (fn:FileNode)
+            WHERE fn.path = uf.path OR fn.path ENDS WITH path_suffix
+            WITH uf, fn
+            WHERE fn IS NOT NULL
+            MERGE (uf)-[:MERGED_FROM]->(fn)
+            SET uf.content_hash = fn.content_hash,
+                uf.size_bytes = fn.size_bytes,
+                uf.mime_type = fn.mime_type,
+                uf.scanned_at = fn.created_at
+            """, {
+            "session_id": session_id,
+            "rows": rows,
+        })
+
+    def ensure_path_indexes(self):
+        """
+        Create path indexes on UnifiedFile, FileNode and File if missing.
+
+        Without them every MATCH/MERGE on path is a label scan. Blocks until
+        the indexes are online so the caller's first query can use them.
+        """
+        with self.driver.session(database=self.database) as session:
+            for name, label in PATH_INDEXES:
+                session.run(self._with_database(
+                    f"CREATE INDEX {name} IF NOT EXISTS FOR (n:{label}) ON (n.path)"
+                )).consume()
+            session.run(self._with_database("CALL db.awaitIndexes(300)")).consume()
+
+    def migrate_file_to_unified(self, batch_size: int = MIGRATION_BATCH_SIZE) -> dict:
         """
         Migrate existing File nodes to UnifiedFile model.
 
         This is a one-time migration operation that:
+        0. Ensures path indexes exist (see ensure_path_indexes)
         1. Creates UnifiedFile nodes from existing File nodes
         2. Links to FileNode if path matches
         3. Migrates ACCESSED_FILE relationships
 
+        All three steps run in one Cypher pass per File node, wrapped in
+        CALL { ... } IN TRANSACTIONS so the server commits every
+        ``batch_size`` rows instead of holding the whole graph in one
+        transaction. This needs an auto-commit transaction, so it uses
+        session.run() and cannot be used inside batch().
+
+        Args:
+            batch_size: Rows committed per inner transaction
+
         Returns:
             dict: Migration statistics
         """
@@ -740,7 +972,9 @@ class CLINeo4jWriter:
             'success': True,
         }
 
-        with self.driver.session() as session:
+        self.ensure_path_indexes()
+
+        with self.driver.session(database=self.database) as session:
             # Count existing File nodes
             result = session.run(
                 self._with_database("MATCH (f:File) RETURN count(f) as count")
@@ -748,11 +982,14 @@ class CLINeo4jWriter:
             file_count = result.single()['count']
             stats['source_file_count'] = file_count
 
-            # Create UnifiedFile from File
-            result = session.execute_write(
-                lambda tx: tx.run(
-                    self._with_database("""
-                    MATCH (f:File)
+            # Single pass per File: create UnifiedFile, link FileNode and
+            # migrate ACCESSED_FILE, carrying uf forward instead of re-matching
+            result = session.run(
+                self._with_database("""
+                MATCH (f:File)
+                WHERE f.path IS NOT NULL
+                CALL {
+                    WITH f
                     MERGE (uf:UnifiedFile {path: f.path})
                     ON CREATE SET
                         uf.id = 'unified_file:' + f.path,
@@ -761,42 +998,70 @@ class CLINeo4jWriter:
                         uf.write_count = COALESCE(f.write_count, 0),
                         uf.created_at = COALESCE(f.created_in_graph, datetime()),
                         uf.first_accessed = f.created_in_graph
-                    RETURN count(uf) as created
-                    """)
-                ).single()
-            )
-            stats['files_migrated'] = result['created'] if result else 0
-
-            # Link to FileNode by path
-            result = session.execute_write(
-                lambda tx: tx.run(
-                    self._with_database("""
-                    MATCH (uf:UnifiedFile)
-                    OPTIONAL MATCH (fn:FileNode)
-                    WHERE fn.path = uf.path
-                    WITH uf, fn
-                    WHERE fn IS NOT NULL
-                    MERGE (uf)-[r:MERGED_FROM]->(fn)
-                    SET uf.content_hash = fn.content_hash,
-                        uf.size_bytes = fn.size_bytes,
-                        uf.mime_type = fn.mime_type
-                    RETURN count(r) as linked
-                    """)
-                ).single()
-            )
-            stats['filenode_links'] = result['linked'] if result else 0
-
-            # Create new ACCESSED_FILE to UnifiedFile (preserving old relationships)
-            result = session.execute_write(
-                lambda tx: tx.run(
-                    self._with_database("""
-                    MATCH (t:CLIToolCall)-[r:ACCESSED_FILE]->(f:File)
-                    MATCH (uf:UnifiedFile {path: f.path})
-                    MERGE (t)-[r2:ACCESSED_UNIFIED_FILE]->(uf)
-                    RETURN count(r2) as migrated
-                    """)
-                ).single()
-            )
-            stats['access_rels_migrated'] = result['migrated'] if result else 0
+
+                    // Link to FileNode by path
+                    WITH f, uf
+                    OPTIONAL MATCH (fn:FileNode {path: f.path})
+                    FOREACH (_ IN CASE WHEN fn IS NULL THEN [] ELSE [1] END |
+                        MERGE (uf)-[:MERGED_FROM]->(fn)
+                        SET uf.content_hash = fn.content_hash,
+                            uf.size_bytes = fn.size_bytes,
+                            uf.mime_type = fn.mime_type
+                    )
+                    WITH f, uf, count(fn) as linked
+
+                    // Create new ACCESSED_FILE to UnifiedFile (preserving old relationships)
+                    CALL {
+                        WITH f, uf
+                        MATCH (t:CLIToolCall)-[:ACCESSED_FILE]->(f)
+                        MERGE (t)-[:ACCESSED_UNIFIED_FILE]->(uf)
+                        RETURN count(*) as migrated
+                    }
+                    RETURN linked, migrated
+                } IN TRANSACTIONS OF $batch_size ROWS
+                RETURN count(*) as created,
+                       sum(linked) as linked,
+                       sum(migrated) as migrated
+                """),
+                {"batch_size": batch_size},
+            ).single()
+            if result:
+                stats['files_migrated'] = result['created'] or 0
+                stats['filenode_links'] = result['linked'] or 0
+                stats['access_rels_migrated'] = result['migrated'] or 0
 
         return stats
+
+
+class _TxScope(CLINeo4jWriter):
+    """CLINeo4jWriter write methods bound to an open transaction (see batch())."""
+
+    def __init__(self, writer: CLINeo4jWriter, tx):
+        self.config = writer.config
+        self.database = writer.database
+        self.driver = None  # Owned by the parent writer
+        self._tx = tx
+
+    def _write(self, query: str, params: dict = None):
+        self._tx.run(self._with_database(query), params or {}).consume()
+
+    def _read(self, query: str, params: dict = None) -> list:
+        return list(self._tx.run(self._with_database(query), params or {}))
+
+    def close(self):
+        pass
+
+    def _session_only(self, name: str):
+        raise RuntimeError(
+            f"{name}() manages its own sessions and cannot run inside batch(); "
+            "call it on the writer instead"
+        )
+
+    def batch(self):
+        self._session_only('batch')
+
+    def ensure_path_indexes(self):
+        self._session_only('ensure_path_indexes')
+
+    def migrate_file_to_unified(self, batch_size: int = MIGRATION_BATCH_SIZE) -> dict:
+        self._session_only('migrate_file_to_unified')
@@ -1,16 +1,57 @@
 """SQLite reader for retrieving session data to sync to Neo4j."""
 
+import json
 import sqlite3
-from typing import List, Optional
+import threading
+from itertools import groupby
+from operator import itemgetter
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
 import sys
 from pathlib import Path
 
 # Add hooks root to path for imports
 HOOKS_DIR = Path(__file__).resolve().parent.parent
-sys.path.insert(0, str(HOOKS_DIR))
+if str(HOOKS_DIR) not in sys.path:
+    sys.path.insert(0, str(HOOKS_DIR))
 
-from core.config import get_db_path
+from core.config import configure_sqlite_connection, get_db_path, optimize_sqlite_connection
+
+# Per-connection prepared statement cache (sqlite3 default is 128)
+STATEMENT_CACHE_SIZE = 256
+
+# Event types fetched together by get_session_bundle()
+BUNDLE_EVENT_TYPES = ('SessionStart', 'SessionEnd', 'UserPromptSubmit', 'PostToolUse')
+
+# Rows per page when paging through unsynced data
+UNSYNCED_BATCH_SIZE = 1000
+
+# Values bound per "... IN (?, ?, ...)" statement
+IN_CLAUSE_CHUNK_SIZE = 500
+
+
+def as_dicts(rows: Iterable[sqlite3.Row]) -> List[dict]:
+    """Materialize rows as plain dicts for callers that need .get() or mutation.
+
+    Args:
+        rows: Rows from one of the reader's iter_* methods
+
+    Returns:
+        List of row dictionaries
+    """
+    return [dict(row) for row in rows]
+
+
+def _tool_usage(usage_json: Optional[str], untitled_count: Optional[int]) -> dict:
+    """Per-tool counts from json_group_object, plus the NULL tool_name bucket.
+
+    json_group_object cannot take a NULL label, so rows without a tool name
+    are counted separately and restored under the None key.
+    """
+    usage = json.loads(usage_json) if usage_json else {}
+    if untitled_count:
+        usage[None] = untitled_count
+    return usage
 
 
 class CLISqliteReader:
@@ -18,16 +59,99 @@ class CLISqliteReader:
 
     def __init__(self):
         self.db_path = get_db_path()
-        self.conn = None
+        self._local = threading.local()
+        self._conns = []
+        self._conns_lock = threading.Lock()
+        self._closed = False
 
     def __enter__(self):
-        self.conn = sqlite3.connect(str(self.db_path))
-        self.conn.row_factory = sqlite3.Row
+        self._closed = False
+        self._connect()  # open the calling thread's connection up front
         return self
 
     def __exit__(self, *args):
-        if self.conn:
-            self.conn.close()
+        self._closed = True
+        with self._conns_lock:
+            conns, self._conns = self._conns, []
+        for conn in conns:
+            optimize_sqlite_connection(conn)
+            conn.close()
+        self._local = threading.local()
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """The calling thread's connection, opened on first use.
+
+        Each thread gets its own connection so concurrent reads run in
+        parallel under WAL instead of serializing on one handle. All of
+        them are closed by __exit__, whichever thread calls it.
+
+        Raises:
+            sqlite3.ProgrammingError: If the reader's context has exited
+        """
+        return self._connect()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Return the calling thread's connection, opening it if needed."""
+        if self._closed:
+            raise sqlite3.ProgrammingError("Cannot use a CLISqliteReader after it was closed")
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(
+                str(self.db_path),
+                cached_statements=STATEMENT_CACHE_SIZE,
+                check_same_thread=False,
+            )
+            conn.row_factory = sqlite3.Row
+            configure_sqlite_connection(conn)
+            self._local.conn = conn
+            with self._conns_lock:
+                self._conns.append(conn)
+        return conn
+
+    def _rows(self, sql: str, params: tuple = ()) -> Iterator[sqlite3.Row]:
+        """Execute a query and return its cursor for row-by-row iteration.
+
+        Rows are stepped lazily from SQLite instead of being fetched into a
+        list first, so large sessions never hold the whole result in memory.
+        """
+        return self.conn.execute(sql, params)
+
+    def _events(self, session_id: str, event_types: Optional[Tuple[str, ...]] = None,
+                limit: Optional[int] = None) -> Iterator[sqlite3.Row]:
+        """Stream a session's events, optionally filtered by event type.
+
+        All event-type lookups share this one query shape, so the SQL text
+        (and its cached prepared statement) only varies with the number of
+        event types requested.
+
+        Args:
+            session_id: The session identifier
+            event_types: Event types to include, or None for all events
+            limit: Optional maximum number of rows
+
+        Returns:
+            Iterator of event rows ordered by timestamp
+        """
+        sql = "SELECT * FROM events WHERE session_id = ?"
+        params = [session_id]
+        if event_types:
+            sql += f" AND event_type IN ({', '.join('?' * len(event_types))})"
+            params.extend(event_types)
+        sql += " ORDER BY timestamp ASC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return self._rows(sql, tuple(params))
+
+    def _first_event(self, session_id: str, event_type: str) -> Optional[dict]:
+        """Get the earliest event of one type for a session as a dict."""
+        row = next(self._events(session_id, (event_type,), limit=1), None)
+        return dict(row) if row else None
+
+    def iter_session_events(self, session_id: str) -> Iterator[sqlite3.Row]:
+        """Stream all events for a session, ordered by timestamp."""
+        return self._events(session_id)
 
     def get_session_events(self, session_id: str) -> List[dict]:
         """Get all events for a session, ordered by timestamp.
@@ -38,13 +162,7 @@ class CLISqliteReader:
         Returns:
             List of event dictionaries
         """
-        cursor = self.conn.cursor()
-        cursor.execute("""
-            SELECT * FROM events
-            WHERE session_id = ?
-            ORDER BY timestamp ASC
-        """, (session_id,))
-        return [dict(row) for row in cursor.fetchall()]
+        return as_dicts(self.iter_session_events(session_id))
 
     def get_session_start_event(self, session_id: str) -> Optional[dict]:
         """Get SessionStart event for a session.
@@ -55,14 +173,7 @@ class CLISqliteReader:
         Returns:
             Event dictionary or None
         """
-        cursor = self.conn.cursor()
-        cursor.execute("""
-            SELECT * FROM events
-            WHERE session_id = ? AND event_type = 'SessionStart'
-            LIMIT 1
-        """, (session_id,))
-        row = cursor.fetchone()
-        return dict(row) if row else None
+        return self._first_event(session_id, 'SessionStart')
 
     def get_session_end_event(self, session_id: str) -> Optional[dict]:
         """Get SessionEnd event for a session.
@@ -73,14 +184,11 @@ class CLISqliteReader:
         Returns:
             Event dictionary or None
         """
-        cursor = self.conn.cursor()
-        cursor.execute("""
-            SELECT * FROM events
-            WHERE session_id = ? AND event_type = 'SessionEnd'
-            LIMIT 1
-        """, (session_id,))
-        row = cursor.fetchone()
-        return dict(row) if row else None
+        return self._first_event(session_id, 'SessionEnd')
+
+    def iter_prompts(self, session_id: str) -> Iterator[sqlite3.Row]:
+        """Stream prompts for a session as sqlite3.Row objects."""
+        return self._events(session_id, ('UserPromptSubmit',))
 
     def get_prompts(self, session_id: str) -> List[dict]:
         """Get all prompts for a session.
@@ -91,13 +199,11 @@ class CLISqliteReader:
         Returns:
             List of prompt event dictionaries
         """
-        cursor = self.conn.cursor()
-        cursor.execute("""
-            SELECT * FROM events
-            WHERE session_id = ? AND event_type = 'UserPromptSubmit'
-            ORDER BY timestamp ASC
-        """, (session_id,))
-        return [dict(row) for row in cursor.fetchall()]
+        return as_dicts(self.iter_prompts(session_id))
+
+    def iter_tool_calls(self, session_id: str) -> Iterator[sqlite3.Row]:
+        """Stream PostToolUse events for a session as sqlite3.Row objects."""
+        return self._events(session_id, ('PostToolUse',))
 
     def get_tool_calls(self, session_id: str) -> List[dict]:
         """Get all PostToolUse events for a session.
@@ -108,13 +214,35 @@ class CLISqliteReader:
         Returns:
             List of tool call event dictionaries
         """
-        cursor = self.conn.cursor()
-        cursor.execute("""
-            SELECT * FROM events
-            WHERE session_id = ? AND event_type = 'PostToolUse'
-            ORDER BY timestamp ASC
-        """, (session_id,))
-        return [dict(row) for row in cursor.fetchall()]
+        return as_dicts(self.iter_tool_calls(session_id))
+
+    def get_session_bundle(self, session_id: str) -> dict:
+        """Get everything needed to sync a session in a single query.
+
+        Fetches SessionStart, SessionEnd, prompt and tool call events in one
+        pass instead of four separate queries. Events are returned as
+        sqlite3.Row objects (key and index access, no per-row dict copy).
+
+        Args:
+            session_id: The session identifier
+
+        Returns:
+            Dictionary with 'start' and 'end' (event Row or None) and
+            'prompts' and 'tool_calls' (lists of event Rows)
+        """
+        bundle = {'start': None, 'end': None, 'prompts': [], 'tool_calls': []}
+        for row in self._events(session_id, BUNDLE_EVENT_TYPES):
+            event_type = row['event_type']
+            if event_type == 'PostToolUse':
+                bundle['tool_calls'].append(row)
+            elif event_type == 'UserPromptSubmit':
+                bundle['prompts'].append(row)
+            elif event_type == 'SessionStart':
+                if bundle['start'] is None:
+                    bundle['start'] = row
+            elif bundle['end'] is None:
+                bundle['end'] = row
+        return bundle
 
     def get_session_summary(self, session_id: str) -> dict:
         """Get aggregated statistics for a session.
@@ -125,59 +253,76 @@ class CLISqliteReader:
         Returns:
             Dictionary with prompt_count, tool_count, tool_usage, error_count
         """
-        cursor = self.conn.cursor()
+        # One pass over the session's rows; SQLite assembles the per-tool dict.
+        row = self.conn.execute("""
+            WITH per_tool AS (
+                SELECT event_type, tool_name, COUNT(*) AS n,
+                       SUM(CASE WHEN success = 0 THEN 1 ELSE 0 END) AS errors
+                FROM events
+                WHERE session_id = ? AND event_type IN ('UserPromptSubmit', 'PostToolUse')
+                GROUP BY event_type, tool_name
+            )
+            SELECT
+                COALESCE(SUM(n) FILTER (WHERE event_type = 'UserPromptSubmit'), 0),
+                COALESCE(SUM(n) FILTER (WHERE event_type = 'PostToolUse'), 0),
+                json_group_object(tool_name, n)
+                    FILTER (WHERE event_type = 'PostToolUse' AND tool_name IS NOT NULL),
+                COALESCE(SUM(errors) FILTER (WHERE event_type = 'PostToolUse'), 0),
+                SUM(n) FILTER (WHERE event_type = 'PostToolUse' AND tool_name IS NULL)
+            FROM per_tool
+        """, (session_id,)).fetchone()
 
-        # Count prompts
-        cursor.execute("""
-            SELECT COUNT(*) as prompt_count
-            FROM events WHERE session_id = ? AND event_type = 'UserPromptSubmit'
-        """, (session_id,))
-        prompt_count = cursor.fetchone()[0]
+        return {
+            'prompt_count': row[0],
+            'tool_count': row[1],
+            'tool_usage': _tool_usage(row[2], row[4]),
+            'error_count': row[3]
+        }
 
-        # Count and aggregate tool calls
-        cursor.execute("""
-            SELECT
-                COUNT(*) as tool_count,
-                tool_name,
-                AVG(duration_ms) as avg_duration,
-                SUM(CASE WHEN success = 0 THEN 1 ELSE 0 END) as error_count
-            FROM events
-            WHERE session_id = ? AND event_type = 'PostToolUse'
-            GROUP BY tool_name
-        """, (session_id,))
+    def iter_unsynced_session_batches(
+            self, batch_size: int = UNSYNCED_BATCH_SIZE) -> Iterator[List[str]]:
+        """Page through sessions with unsynced events in session_id order.
 
-        tool_usage = {}
-        total_tool_count = 0
-        total_errors = 0
+        Uses keyset pagination on session_id, which the partial
+        idx_events_unsynced(session_id, timestamp) index can seek, so each
+        page reads only its own sessions' unsynced rows. Callers may mark
+        sessions synced between pages without shifting the window.
 
-        for row in cursor.fetchall():
-            tool_name = row[1]
-            count = row[0]
-            tool_usage[tool_name] = count
-            total_tool_count += count
-            total_errors += row[3] or 0
+        Args:
+            batch_size: Maximum session IDs per page
 
-        return {
-            'prompt_count': prompt_count,
-            'tool_count': total_tool_count,
-            'tool_usage': tool_usage,
-            'error_count': total_errors
-        }
+        Yields:
+            Lists of session IDs
+        """
+        last = ''
+        while True:
+            rows = self.conn.execute("""
+                SELECT session_id
+                FROM events
+                WHERE synced_to_neo4j = 0 AND session_id > ?
+                GROUP BY session_id
+                ORDER BY session_id
+                LIMIT ?
+            """, (last, batch_size)).fetchall()
+            if not rows:
+                return
+            yield [row[0] for row in rows]
+            last = rows[-1][0]
 
     def get_unsynced_sessions(self) -> List[str]:
         """Get list of session IDs that haven't been synced to Neo4j.
 
         Returns:
-            List of session IDs with unsynced events
+            List of session IDs with unsynced events, oldest first
         """
-        cursor = self.conn.cursor()
-        cursor.execute("""
-            SELECT DISTINCT session_id
+        rows = self.conn.execute("""
+            SELECT session_id
             FROM events
             WHERE synced_to_neo4j = 0
-            ORDER BY timestamp ASC
-        """)
-        return [row[0] for row in cursor.fetchall()]
+            GROUP BY session_id
+            ORDER BY MIN(timestamp), session_id
+        """).fetchall()
+        return [row[0] for row in rows]
 
     def is_session_complete(self, session_id: str) -> bool:
         """Check if a session has a SessionEnd event.
@@ -195,18 +340,38 @@ class CLISqliteReader:
         """, (session_id,))
         return cursor.fetchone()[0] > 0
 
+    def _mark_synced(self, table: str, session_ids: Iterable[str]):
+        """Flag every row of the given sessions as synced, in one transaction.
+
+        Args:
+            table: Table with session_id and synced_to_neo4j columns
+            session_ids: Session identifiers to mark
+        """
+        ids = list(dict.fromkeys(session_ids))
+        for start in range(0, len(ids), IN_CLAUSE_CHUNK_SIZE):
+            chunk = ids[start:start + IN_CLAUSE_CHUNK_SIZE]
+            placeholders = ','.join('?' * len(chunk))
+            self.conn.execute(f"""
+                UPDATE {table} SET synced_to_neo4j = 1
+                WHERE session_id IN ({placeholders}) AND synced_to_neo4j = 0
+            """, chunk)
+        self.conn.commit()
+
+    def mark_sessions_synced(self, session_ids: Iterable[str]):
+        """Mark all events for the given sessions as synced to Neo4j.
+
+        Args:
+            session_ids: Session identifiers to mark
+        """
+        self._mark_synced('events', session_ids)
+
     def mark_session_synced(self, session_id: str):
         """Mark all events for a session as synced to Neo4j.
 
         Args:
             session_id: The session identifier
         """
-        cursor = self.conn.cursor()
-        cursor.execute("""
-            UPDATE events SET synced_to_neo4j = 1
-            WHERE session_id = ?
-        """, (session_id,))
-        self.conn.commit()
+        self.mark_sessions_synced([session_id])
 
     def get_session_ids_by_date_range(self, start_date: str, end_date: str) -> List[str]:
         """Get session IDs within a date range.
@@ -240,13 +405,15 @@ class CLISqliteReader:
         Returns:
             List of SubagentStop event dictionaries
         """
-        cursor = self.conn.cursor()
-        cursor.execute("""
+        return as_dicts(self._events(session_id, ('SubagentStop',)))
+
+    def iter_subagent_tool_calls(self, agent_id: str) -> Iterator[sqlite3.Row]:
+        """Stream tool calls made by a subagent as sqlite3.Row objects."""
+        return self._rows("""
             SELECT * FROM events
-            WHERE session_id = ? AND event_type = 'SubagentStop'
+            WHERE agent_id = ? AND event_type = 'SubagentToolCall'
             ORDER BY timestamp ASC
-        """, (session_id,))
-        return [dict(row) for row in cursor.fetchall()]
+        """, (agent_id,))
 
     def get_subagent_tool_calls(self, agent_id: str) -> List[dict]:
         """Get all tool calls made by a specific subagent.
@@ -257,13 +424,32 @@ class CLISqliteReader:
         Returns:
             List of SubagentToolCall event dictionaries
         """
-        cursor = self.conn.cursor()
-        cursor.execute("""
-            SELECT * FROM events
-            WHERE agent_id = ? AND event_type = 'SubagentToolCall'
-            ORDER BY timestamp ASC
-        """, (agent_id,))
-        return [dict(row) for row in cursor.fetchall()]
+        return as_dicts(self.iter_subagent_tool_calls(agent_id))
+
+    def get_subagent_tool_calls_bulk(
+            self, agent_ids: Iterable[str]) -> Dict[str, List[sqlite3.Row]]:
+        """Get tool calls for several subagents with one query per IN-clause chunk.
+
+        Args:
+            agent_ids: Subagent session IDs
+
+        Returns:
+            Dict mapping agent_id to its SubagentToolCall event Rows, in
+            timestamp order; agents without tool calls are absent
+        """
+        ids = list(dict.fromkeys(agent_ids))
+        calls = {}
+        for start in range(0, len(ids), IN_CLAUSE_CHUNK_SIZE):
+            chunk = ids[start:start + IN_CLAUSE_CHUNK_SIZE]
+            placeholders = ','.join('?' * len(chunk))
+            rows = self._rows(f"""
+                SELECT * FROM events
+                WHERE agent_id IN ({placeholders}) AND event_type = 'SubagentToolCall'
+                ORDER BY agent_id, timestamp ASC
+            """, chunk)
+            for agent_id, group in groupby(rows, key=itemgetter('agent_id')):
+                calls[agent_id] = list(group)
+        return calls
 
     def get_subagent_tool_calls_by_parent(self, parent_session_id: str) -> List[dict]:
         """Get all subagent tool calls for a parent session.
@@ -307,50 +493,43 @@ class CLISqliteReader:
         Returns:
             Dictionary with subagent_count, total_tool_calls, tool_usage
         """
-        cursor = self.conn.cursor()
-
-        # Count distinct subagents
-        cursor.execute("""
-            SELECT COUNT(DISTINCT agent_id) as subagent_count
-            FROM events
-            WHERE parent_session_id = ? AND is_subagent_event = 1
-        """, (parent_session_id,))
-        subagent_count = cursor.fetchone()[0]
-
-        # Count and aggregate subagent tool calls
-        cursor.execute("""
+        row = self.conn.execute("""
+            WITH per_tool AS (
+                SELECT tool_name, COUNT(*) AS n,
+                       SUM(CASE WHEN success = 0 THEN 1 ELSE 0 END) AS errors
+                FROM events
+                WHERE parent_session_id = ?1 AND event_type = 'SubagentToolCall'
+                GROUP BY tool_name
+            )
             SELECT
-                COUNT(*) as tool_count,
-                tool_name,
-                subagent_type,
-                SUM(CASE WHEN success = 0 THEN 1 ELSE 0 END) as error_count
-            FROM events
-            WHERE parent_session_id = ? AND event_type = 'SubagentToolCall'
-            GROUP BY tool_name
-        """, (parent_session_id,))
-
-        tool_usage = {}
-        total_tool_count = 0
-        total_errors = 0
-
-        for row in cursor.fetchall():
-            tool_name = row[1]
-            count = row[0]
-            tool_usage[tool_name] = count
-            total_tool_count += count
-            total_errors += row[3] or 0
+                (SELECT COUNT(DISTINCT agent_id) FROM events
+                 WHERE parent_session_id = ?1 AND is_subagent_event = 1),
+                COALESCE(SUM(n), 0),
+                json_group_object(tool_name, n) FILTER (WHERE tool_name IS NOT NULL),
+                COALESCE(SUM(errors), 0),
+                SUM(n) FILTER (WHERE tool_name IS NULL)
+            FROM per_tool
+        """, (parent_session_id,)).fetchone()
 
         return {
-            'subagent_count': subagent_count,
-            'total_tool_calls': total_tool_count,
-            'tool_usage': tool_usage,
-            'error_count': total_errors
+            'subagent_count': row[0],
+            'total_tool_calls': row[1],
+            'tool_usage': _tool_usage(row[2], row[4]),
+            'error_count': row[3]
         }
 
     # -------------------------------------------------------------------------
     # File Access Query Methods (v7)
     # -------------------------------------------------------------------------
 
+    def iter_file_accesses(self, session_id: str) -> Iterator[sqlite3.Row]:
+        """Stream file access events for a session as sqlite3.Row objects."""
+        return self._rows("""
+            SELECT * FROM file_access_log
+            WHERE session_id = ?
+            ORDER BY timestamp ASC
+        """, (session_id,))
+
     def get_file_accesses(self, session_id: str) -> List[dict]:
         """Get all file access events for a session.
 
@@ -360,13 +539,38 @@ class CLISqliteReader:
         Returns:
             List of file access dictionaries
         """
-        cursor = self.conn.cursor()
-        cursor.execute("""
-            SELECT * FROM file_access_log
-            WHERE session_id = ?
-            ORDER BY timestamp ASC
-        """, (session_id,))
-        return [dict(row) for row in cursor.fetchall()]
+        return as_dicts(self.iter_file_accesses(session_id))
+
+    def iter_unsynced_file_access_batches(
+            self, batch_size: int = UNSYNCED_BATCH_SIZE) -> Iterator[List[sqlite3.Row]]:
+        """Page through file accesses not yet synced, oldest first.
+
+        Keyset pagination on (timestamp, id) keeps each page a bounded
+        index-ordered query instead of one cursor over every unsynced row.
+
+        Args:
+            batch_size: Maximum rows per page
+
+        Yields:
+            Lists of sqlite3.Row objects
+        """
+        last = ('', 0)
+        while True:
+            rows = self.conn.execute("""
+                SELECT * FROM file_access_log
+                WHERE synced_to_neo4j = 0 AND (timestamp, id) > (?, ?)
+                ORDER BY timestamp, id
+                LIMIT ?
+            """, (*last, batch_size)).fetchall()
+            if not rows:
+                return
+            yield rows
+            last = (rows[-1]['timestamp'], rows[-1]['id'])
+
+    def iter_unsynced_file_accesses(self) -> Iterator[sqlite3.Row]:
+        """Stream file accesses not yet synced to Neo4j."""
+        for batch in self.iter_unsynced_file_access_batches():
+            yield from batch
 
     def get_unsynced_file_accesses(self) -> List[dict]:
         """Get file accesses not yet synced to Neo4j.
@@ -374,13 +578,7 @@ class CLISqliteReader:
         Returns:
             List of unsynced file access dictionaries
         """
-        cursor = self.conn.cursor()
-        cursor.execute("""
-            SELECT * FROM file_access_log
-            WHERE synced_to_neo4j = 0
-            ORDER BY timestamp ASC
-        """)
-        return [dict(row) for row in cursor.fetchall()]
+        return as_dicts(self.iter_unsynced_file_accesses())
 
     def get_session_files(self, session_id: str) -> List[str]:
         """Get unique file paths accessed in a session.
@@ -408,41 +606,26 @@ class CLISqliteReader:
         Returns:
             Dictionary with access counts by mode, project_root, etc.
         """
-        cursor = self.conn.cursor()
-
-        # Total file accesses
-        cursor.execute("""
-            SELECT COUNT(*) as total_accesses,
-                   COUNT(DISTINCT normalized_path) as unique_files
-            FROM file_access_log
-            WHERE session_id = ?
-        """, (session_id,))
-        row = cursor.fetchone()
-        total_accesses = row[0]
-        unique_files = row[1]
-
-        # Access counts by mode
-        cursor.execute("""
-            SELECT access_mode, COUNT(*) as count
-            FROM file_access_log
-            WHERE session_id = ?
-            GROUP BY access_mode
-        """, (session_id,))
-        by_mode = {row[0]: row[1] for row in cursor.fetchall()}
-
-        # Project roots accessed
-        cursor.execute("""
-            SELECT DISTINCT project_root
+        row = self.conn.execute("""
+            SELECT
+                COUNT(*),
+                COUNT(DISTINCT normalized_path),
+                (SELECT json_group_object(access_mode, n) FROM (
+                    SELECT access_mode, COUNT(*) AS n FROM file_access_log
+                    WHERE session_id = ?1
+                    GROUP BY access_mode
+                )),
+                json_group_array(DISTINCT project_root)
+                    FILTER (WHERE project_root IS NOT NULL)
             FROM file_access_log
-            WHERE session_id = ? AND project_root IS NOT NULL
-        """, (session_id,))
-        project_roots = [row[0] for row in cursor.fetchall()]
+            WHERE session_id = ?1
+        """, (session_id,)).fetchone()
 
         return {
-            'total_accesses': total_accesses,
-            'unique_files': unique_files,
-            'by_mode': by_mode,
-            'project_roots': project_roots
+            'total_accesses': row[0],
+            'unique_files': row[1],
+            'by_mode': json.loads(row[2]),
+            'project_roots': json.loads(row[3])
         }
 
     def get_co_accessed_files(self, file_path: str, min_count: int = 2) -> List[dict]:
@@ -455,14 +638,19 @@ class CLISqliteReader:
         Returns:
             List of dicts with file_path and co_access_count
         """
+        # Seed the sessions that touched file_path once (path index), then fan
+        # out per session (session index); no per-session k*k self-join rows.
         cursor = self.conn.cursor()
         cursor.execute("""
-            SELECT f2.normalized_path, COUNT(DISTINCT f2.session_id) as co_access_count
-            FROM file_access_log f1
-            JOIN file_access_log f2 ON f1.session_id = f2.session_id
-            WHERE f1.normalized_path = ?
-              AND f2.normalized_path != ?
-            GROUP BY f2.normalized_path
+            WITH target_sessions AS (
+                SELECT DISTINCT session_id FROM file_access_log
+                WHERE normalized_path = ?
+            )
+            SELECT f.normalized_path, COUNT(DISTINCT f.session_id) as co_access_count
+            FROM file_access_log f
+            JOIN target_sessions t ON t.session_id = f.session_id
+            WHERE f.normalized_path != ?
+            GROUP BY f.normalized_path
             HAVING co_access_count >= ?
             ORDER BY co_access_count DESC
         """, (file_path, file_path, min_count))
@@ -496,18 +684,21 @@ class CLISqliteReader:
             'session_count': row[3]
         } for row in cursor.fetchall()]
 
+    def mark_sessions_file_accesses_synced(self, session_ids: Iterable[str]):
+        """Mark all file access events for the given sessions as synced.
+
+        Args:
+            session_ids: Session identifiers to mark
+        """
+        self._mark_synced('file_access_log', session_ids)
+
     def mark_file_accesses_synced(self, session_id: str):
         """Mark all file access events for a session as synced.
 
         Args:
             session_id: The session identifier
         """
-        cursor = self.conn.cursor()
-        cursor.execute("""
-            UPDATE file_access_log SET synced_to_neo4j = 1
-            WHERE session_id = ?
-        """, (session_id,))
-        self.conn.commit()
+        self.mark_sessions_file_accesses_synced([session_id])
 
     def get_glob_expansions(self, session_id: str) -> List[dict]:
         """Get all glob expansion results for a session.
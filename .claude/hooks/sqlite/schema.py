@@ -0,0 +1,551 @@
+"""SQLite schema creation and migrations for the hooks database.
+
+CLISqliteWriter calls ensure_schema() on open, which costs one
+PRAGMA user_version read once the database is current. Run this module
+directly to create or upgrade the database ahead of time, so no hook
+process ever pays for a migration:
+
+    python .claude/hooks/sqlite/schema.py
+"""
+
+import json
+import sqlite3
+import sys
+from pathlib import Path
+
+# Add hooks root to path for imports
+HOOKS_DIR = Path(__file__).resolve().parent.parent
+if str(HOOKS_DIR) not in sys.path:
+    sys.path.insert(0, str(HOOKS_DIR))
+
+from core.config import configure_sqlite_connection, get_db_path
+from core.helpers import (
+    classify_tool,
+    extract_file_path,
+    extract_command,
+    extract_pattern,
+    extract_url,
+    extract_subagent_type,
+    compute_prompt_hash,
+    count_words,
+    analyze_tool_response,
+    normalize_path,
+)
+
+
+SCHEMA_VERSION = 9  # v9: partial indexes replace low-cardinality ones (v8: composite reader indexes)
+
+# Indexes dropped in v9: single-column indexes on 2-4 value flags (replaced by
+# partial indexes), plain prefixes of composite indexes, and indexes
+# superseded by the v8 composite ones. Each one cost a B-tree write per INSERT.
+OBSOLETE_INDEXES = (
+    'idx_events_success',
+    'idx_events_synced',
+    'idx_events_is_subagent',
+    'idx_events_access_mode',
+    'idx_events_session',
+    'idx_events_session_type',
+    'idx_events_agent_id',
+    'idx_file_access_mode',
+    'idx_file_access_synced',
+    'idx_file_access_session',
+)
+
+# Rows per executemany when backfilling extracted fields during migration
+BACKFILL_BATCH_SIZE = 500
+
+# Top-level fields copied as-is by the backfill when present and non-empty
+_BACKFILL_COMMON_KEYS = ('transcript_path', 'cwd', 'permission_mode')
+
+# (column, extractor(tool_name, tool_input)) pairs backfilled for tool events
+_BACKFILL_TOOL_EXTRACTORS = (
+    ('subagent_type', extract_subagent_type),
+    ('file_path', lambda name, tool_input: normalize_path(extract_file_path(name, tool_input))),
+    ('command', extract_command),
+    ('pattern', extract_pattern),
+    ('url', extract_url),
+)
+
+
+def get_schema_version(conn: sqlite3.Connection) -> int:
+    """Return the schema version stamped in PRAGMA user_version (0 if never set)."""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def ensure_schema(conn: sqlite3.Connection) -> int:
+    """Create/migrate tables and indexes.
+
+    PRAGMA user_version records the schema version once setup has run,
+    so an up-to-date database costs a single integer read. Otherwise the
+    whole migration chain runs in one BEGIN IMMEDIATE transaction and
+    commits (and fsyncs) once.
+
+    Args:
+        conn: Open connection with no transaction in progress
+
+    Returns:
+        Schema version of the database afterwards
+    """
+    version = get_schema_version(conn)
+    if version >= SCHEMA_VERSION:
+        return version
+
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        # Another hook process may have migrated while we waited for the lock
+        version = get_schema_version(conn)
+        if version < SCHEMA_VERSION:
+            cursor = conn.cursor()
+            _migrate(cursor)
+            version = SCHEMA_VERSION
+    except BaseException:
+        conn.rollback()
+        raise
+    conn.commit()
+    return version
+
+
+def _migrate(cursor):
+    """Bring the schema up to SCHEMA_VERSION; runs inside ensure_schema's transaction."""
+    # Check if events table exists
+    cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='events'")
+    table_exists = cursor.fetchone() is not None
+
+    if table_exists:
+        # Check if migration needed by looking for new columns
+        cursor.execute("PRAGMA table_info(events)")
+        columns = {row[1] for row in cursor.fetchall()}
+
+        if 'tool_use_id' not in columns:
+            _migrate_schema_v1_to_v2(cursor)
+        if 'synced_to_neo4j' not in columns:
+            _migrate_schema_v2_to_v3(cursor)
+        if 'subagent_type' not in columns:
+            _migrate_schema_v3_to_v4(cursor)
+        if 'parent_session_id' not in columns:
+            _migrate_schema_v4_to_v5(cursor)
+        if 'intent_type' not in columns:
+            _migrate_schema_v5_to_v6(cursor)
+        if 'file_paths_json' not in columns:
+            _migrate_schema_v6_to_v7(cursor)
+
+        # v1 rows are backfilled once every column they may fill exists
+        if 'tool_use_id' not in columns:
+            _backfill_existing_data(cursor)
+
+        # Pick up indexes added since the database was created
+        _create_indexes(cursor)
+        _create_file_access_indexes(cursor)
+        _drop_obsolete_indexes(cursor)
+    else:
+        _create_schema_v7(cursor)
+
+    cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+
+def _create_schema_v7(cursor):
+    """Create the enhanced schema (v7) with file_access_log table."""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS events (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            session_id TEXT NOT NULL,
+            event_type TEXT NOT NULL,
+            timestamp TEXT NOT NULL,
+            raw_json TEXT NOT NULL,
+
+            transcript_path TEXT,
+            cwd TEXT,
+            permission_mode TEXT,
+
+            git_branch TEXT,
+            platform TEXT,
+            python_version TEXT,
+
+            tool_use_id TEXT,
+            tool_name TEXT,
+            tool_category TEXT,
+            subagent_type TEXT,
+
+            file_path TEXT,
+            command TEXT,
+            pattern TEXT,
+            url TEXT,
+
+            duration_ms REAL,
+
+            success INTEGER,
+            error_message TEXT,
+            has_stderr INTEGER,
+            was_interrupted INTEGER,
+
+            output_size_bytes INTEGER,
+
+            prompt_text TEXT,
+            prompt_hash TEXT,
+            prompt_length INTEGER,
+            prompt_word_count INTEGER,
+
+            synced_to_neo4j INTEGER DEFAULT 0,
+
+            -- v5: Subagent tracking columns
+            parent_session_id TEXT,
+            agent_id TEXT,
+            is_subagent_event INTEGER DEFAULT 0,
+
+            -- v6: Intent classification and sequence tracking
+            intent_type TEXT,
+            sequence_index INTEGER DEFAULT 0,
+
+            -- v7: Enhanced file tracking
+            file_paths_json TEXT,
+            access_mode TEXT,
+            project_root TEXT,
+            glob_match_count INTEGER
+        )
+    """)
+
+    # Cache table for Pre/Post tool matching
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS tool_call_cache (
+            tool_use_id TEXT PRIMARY KEY,
+            session_id TEXT NOT NULL,
+            tool_name TEXT NOT NULL,
+            start_timestamp TEXT NOT NULL,
+            tool_input_json TEXT
+        )
+    """)
+
+    # Cache table for session duration and sequence tracking
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS session_cache (
+            session_id TEXT PRIMARY KEY,
+            start_timestamp TEXT NOT NULL,
+            cwd TEXT,
+            git_branch TEXT,
+            platform TEXT,
+            python_version TEXT,
+            prompt_sequence INTEGER DEFAULT 0,
+            tool_sequence INTEGER DEFAULT 0
+        )
+    """)
+
+    # v7: File access log table for multi-file tracking
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS file_access_log (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            event_id INTEGER REFERENCES events(id),
+            session_id TEXT NOT NULL,
+            file_path TEXT NOT NULL,
+            normalized_path TEXT NOT NULL,
+            access_mode TEXT NOT NULL,
+            project_root TEXT,
+            timestamp TEXT NOT NULL,
+            tool_name TEXT,
+            line_numbers_json TEXT,
+            is_primary_target INTEGER DEFAULT 1,
+            is_glob_expansion INTEGER DEFAULT 0,
+            synced_to_neo4j INTEGER DEFAULT 0
+        )
+    """)
+
+    _create_indexes(cursor)
+    _create_file_access_indexes(cursor)
+
+
+def _migrate_schema_v1_to_v2(cursor):
+    """Migrate from v1 (basic) to v2 (enhanced) schema."""
+    new_columns = [
+        ('transcript_path', 'TEXT'),
+        ('cwd', 'TEXT'),
+        ('permission_mode', 'TEXT'),
+        ('git_branch', 'TEXT'),
+        ('platform', 'TEXT'),
+        ('python_version', 'TEXT'),
+        ('tool_use_id', 'TEXT'),
+        ('tool_name', 'TEXT'),
+        ('tool_category', 'TEXT'),
+        ('file_path', 'TEXT'),
+        ('command', 'TEXT'),
+        ('pattern', 'TEXT'),
+        ('url', 'TEXT'),
+        ('duration_ms', 'REAL'),
+        ('success', 'INTEGER'),
+        ('error_message', 'TEXT'),
+        ('has_stderr', 'INTEGER'),
+        ('was_interrupted', 'INTEGER'),
+        ('output_size_bytes', 'INTEGER'),
+        ('prompt_text', 'TEXT'),
+        ('prompt_hash', 'TEXT'),
+        ('prompt_length', 'INTEGER'),
+        ('prompt_word_count', 'INTEGER'),
+    ]
+
+    _add_missing_columns(cursor, 'events', new_columns)
+
+    # Create cache tables
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS tool_call_cache (
+            tool_use_id TEXT PRIMARY KEY,
+            session_id TEXT NOT NULL,
+            tool_name TEXT NOT NULL,
+            start_timestamp TEXT NOT NULL,
+            tool_input_json TEXT
+        )
+    """)
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS session_cache (
+            session_id TEXT PRIMARY KEY,
+            start_timestamp TEXT NOT NULL,
+            cwd TEXT,
+            git_branch TEXT,
+            platform TEXT,
+            python_version TEXT
+        )
+    """)
+
+
+def _migrate_schema_v2_to_v3(cursor):
+    """Migrate from v2 to v3 - add synced_to_neo4j column."""
+    _add_missing_columns(cursor, 'events', [('synced_to_neo4j', 'INTEGER DEFAULT 0')])
+
+
+def _migrate_schema_v3_to_v4(cursor):
+    """Migrate from v3 to v4 - add subagent_type column."""
+    _add_missing_columns(cursor, 'events', [('subagent_type', 'TEXT')])
+
+
+def _migrate_schema_v4_to_v5(cursor):
+    """Migrate from v4 to v5 - add subagent tracking columns."""
+    new_columns = [
+        ('parent_session_id', 'TEXT'),
+        ('agent_id', 'TEXT'),
+        ('is_subagent_event', 'INTEGER DEFAULT 0'),
+    ]
+
+    _add_missing_columns(cursor, 'events', new_columns)
+
+
+def _migrate_schema_v5_to_v6(cursor):
+    """Migrate from v5 to v6 - add intent_type and sequence_index columns."""
+    new_columns = [
+        ('intent_type', 'TEXT'),
+        ('sequence_index', 'INTEGER DEFAULT 0'),
+    ]
+
+    _add_missing_columns(cursor, 'events', new_columns)
+
+    # Add sequence columns to session_cache
+    _add_missing_columns(cursor, 'session_cache', [
+        ('prompt_sequence', 'INTEGER DEFAULT 0'),
+        ('tool_sequence', 'INTEGER DEFAULT 0'),
+    ])
+
+
+def _create_indexes(cursor):
+    """Create all indexes for efficient querying."""
+    indexes = [
+        ('idx_events_type', 'events(event_type)'),
+        ('idx_events_timestamp', 'events(timestamp)'),
+        ('idx_events_tool_name', 'events(tool_name)'),
+        ('idx_events_tool_category', 'events(tool_category)'),
+        ('idx_events_tool_use_id', 'events(tool_use_id)'),
+        ('idx_events_file_path', 'events(file_path)'),
+        ('idx_events_prompt_hash', 'events(prompt_hash)'),
+        # Covers reader lookups by (session_id, event_type) ORDER BY timestamp
+        ('idx_events_session_type_ts', 'events(session_id, event_type, timestamp)'),
+        ('idx_events_session_timestamp', 'events(session_id, timestamp)'),
+        ('idx_events_subagent_type', 'events(subagent_type)'),
+        # v5: Subagent tracking indexes
+        ('idx_events_parent_session', 'events(parent_session_id)'),
+        ('idx_events_agent_type_ts', 'events(agent_id, event_type, timestamp)'),
+        # v6: Intent and sequence indexes
+        ('idx_events_intent_type', 'events(intent_type)'),
+        ('idx_events_sequence', 'events(session_id, sequence_index)'),
+        # v7: Enhanced file tracking indexes
+        ('idx_events_project_root', 'events(project_root)'),
+        # v9: Partial indexes over the few rows the sync job scans
+        ('idx_events_unsynced', 'events(session_id, timestamp) WHERE synced_to_neo4j = 0'),
+        ('idx_events_subagent', 'events(parent_session_id, agent_id) WHERE is_subagent_event = 1'),
+    ]
+
+    for idx_name, idx_def in indexes:
+        try:
+            cursor.execute(f"CREATE INDEX IF NOT EXISTS {idx_name} ON {idx_def}")
+        except sqlite3.OperationalError:
+            pass  # Index already exists
+
+
+def _create_file_access_indexes(cursor):
+    """Create indexes for file_access_log table."""
+    indexes = [
+        ('idx_file_access_path', 'file_access_log(normalized_path)'),
+        ('idx_file_access_project', 'file_access_log(project_root)'),
+        ('idx_file_access_session_synced_ts',
+         'file_access_log(session_id, synced_to_neo4j, timestamp)'),
+        ('idx_file_access_event', 'file_access_log(event_id)'),
+        # v9: Keyset paging over unsynced accesses
+        ('idx_file_access_unsynced', 'file_access_log(timestamp, id) WHERE synced_to_neo4j = 0'),
+    ]
+
+    for idx_name, idx_def in indexes:
+        try:
+            cursor.execute(f"CREATE INDEX IF NOT EXISTS {idx_name} ON {idx_def}")
+        except sqlite3.OperationalError:
+            pass  # Index already exists
+
+
+def _add_missing_columns(cursor, table: str, columns: list):
+    """ALTER TABLE ... ADD COLUMN for each (name, type) not already on the table."""
+    existing = {row[1] for row in cursor.execute(f"PRAGMA table_info({table})")}
+    for col_name, col_type in columns:
+        if col_name not in existing:
+            cursor.execute(f"ALTER TABLE {table} ADD COLUMN {col_name} {col_type}")
+
+
+def _drop_obsolete_indexes(cursor):
+    """Drop indexes retired in v9 (see OBSOLETE_INDEXES)."""
+    for idx_name in OBSOLETE_INDEXES:
+        cursor.execute(f"DROP INDEX IF EXISTS {idx_name}")
+
+
+def _migrate_schema_v6_to_v7(cursor):
+    """Migrate from v6 to v7 - add enhanced file tracking columns and file_access_log table."""
+    # Add new columns to events table
+    new_columns = [
+        ('file_paths_json', 'TEXT'),
+        ('access_mode', 'TEXT'),
+        ('project_root', 'TEXT'),
+        ('glob_match_count', 'INTEGER'),
+    ]
+
+    _add_missing_columns(cursor, 'events', new_columns)
+
+    # Create file_access_log table
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS file_access_log (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            event_id INTEGER REFERENCES events(id),
+            session_id TEXT NOT NULL,
+            file_path TEXT NOT NULL,
+            normalized_path TEXT NOT NULL,
+            access_mode TEXT NOT NULL,
+            project_root TEXT,
+            timestamp TEXT NOT NULL,
+            tool_name TEXT,
+            line_numbers_json TEXT,
+            is_primary_target INTEGER DEFAULT 1,
+            is_glob_expansion INTEGER DEFAULT 0,
+            synced_to_neo4j INTEGER DEFAULT 0
+        )
+    """)
+
+
+def _backfill_existing_data(cursor):
+    """Backfill extracted fields from existing raw_json data.
+
+    Rows are streamed from the SELECT rather than fetched up front.
+    Updates are grouped by the fields they set, so each group shares one
+    prepared UPDATE and is flushed with executemany.
+    """
+    update_cursor = cursor.connection.cursor()
+    buckets = {}
+
+    rows = cursor.execute("""
+        SELECT id, event_type, raw_json FROM events
+        WHERE tool_name IS NULL AND tool_use_id IS NULL
+        ORDER BY id
+    """)
+    for row_id, event_type, raw_json_str in rows:
+        try:
+            updates = _extract_fields_from_data(event_type, json.loads(raw_json_str))
+        except Exception:
+            continue  # Skip problematic rows
+
+        if not updates:
+            continue
+
+        keys = tuple(updates)
+        bucket = buckets.setdefault(keys, [])
+        bucket.append((*updates.values(), row_id))
+        if len(bucket) >= BACKFILL_BATCH_SIZE:
+            _flush_backfill_bucket(update_cursor, keys, bucket)
+
+    for keys, bucket in buckets.items():
+        _flush_backfill_bucket(update_cursor, keys, bucket)
+
+
+def _flush_backfill_bucket(cursor, keys: tuple, bucket: list):
+    """Apply and clear one bucket of backfill updates sharing the same fields."""
+    if not bucket:
+        return
+    set_clause = ', '.join(f"{k} = ?" for k in keys)
+    cursor.executemany(f"UPDATE events SET {set_clause} WHERE id = ?", bucket)
+    bucket.clear()
+
+
+def _extract_fields_from_data(event_type: str, data: dict) -> dict:
+    """Extract fields from raw event data for backfill.
+
+    Only non-None values are included, so the caller never overwrites a
+    column with NULL.
+    """
+    updates = {key: value for key in _BACKFILL_COMMON_KEYS if (value := data.get(key))}
+
+    if event_type in ('PreToolUse', 'PostToolUse'):
+        tool_name = data.get('tool_name') or data.get('toolName')
+        tool_input = data.get('tool_input') or data.get('toolInput') or {}
+
+        tool_use_id = data.get('tool_use_id') or data.get('toolUseId')
+        if tool_use_id is not None:
+            updates['tool_use_id'] = tool_use_id
+        if tool_name:
+            updates['tool_name'] = tool_name
+            updates['tool_category'] = classify_tool(tool_name)
+            for column, extract in _BACKFILL_TOOL_EXTRACTORS:
+                value = extract(tool_name, tool_input)
+                if value is not None:
+                    updates[column] = value
+
+        if event_type == 'PostToolUse':
+            tool_response = data.get('tool_response') or data.get('toolOutput')
+            success, error_msg, has_stderr, interrupted, output_size = analyze_tool_response(tool_response)
+            updates['success'] = 1 if success else 0
+            updates['has_stderr'] = 1 if has_stderr else 0
+            updates['was_interrupted'] = 1 if interrupted else 0
+            updates['output_size_bytes'] = output_size
+            if error_msg is not None:
+                updates['error_message'] = error_msg
+
+    elif event_type == 'UserPromptSubmit':
+        prompt = data.get('prompt', '')
+        if prompt:
+            updates['prompt_text'] = prompt[:1000]
+            updates['prompt_hash'] = compute_prompt_hash(prompt)
+            updates['prompt_length'] = len(prompt)
+            updates['prompt_word_count'] = count_words(prompt)
+
+    return updates
+
+
+def main():
+    """Create or upgrade the hooks database at the configured path."""
+    db_path = get_db_path()
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+
+    conn = sqlite3.connect(str(db_path))
+    try:
+        configure_sqlite_connection(conn)
+        before = get_schema_version(conn)
+        after = ensure_schema(conn)
+    finally:
+        conn.close()
+
+    if before == after:
+        print(f"{db_path}: schema v{after} is current")
+    else:
+        print(f"{db_path}: schema upgraded v{before} -> v{after}")
+
+
+if __name__ == "__main__":
+    main()
@@ -119,47 +119,18 @@ def sqlite_writer(temp_sqlite_db):
             self.conn.row_factory = sqlite3.Row
 
         def log_file_access(self, event_id, session_id, tool_name, file_result, timestamp):
-            """Log file access to database."""
-            cursor = self.conn.cursor()
-
-            # Log primary path
-            if file_result.primary_path:
-                cursor.execute("""
-                    INSERT INTO file_access_log
-                    (event_id, session_id, file_path, normalized_path, access_mode,
-                     project_root, tool_name, timestamp, is_primary_target, is_glob_expansion)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, 1, ?)
-                """, (
-                    event_id,
-                    session_id,
-                    file_result.primary_path,
-                    file_result.primary_path,
-                    file_result.access_mode,
-                    file_result.project_root,
-                    tool_name,
-                    timestamp,
-                    1 if file_result.is_glob_expansion else 0,
-                ))
-
-            # Log related paths
-            for path in file_result.related_paths:
-                cursor.execute("""
-                    INSERT INTO file_access_log
-                    (event_id, session_id, file_path, normalized_path, access_mode,
-                     project_root, tool_name, timestamp, is_primary_target, is_glob_expansion)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, 0, ?)
-                """, (
-                    event_id,
-                    session_id,
-                    path,
-                    path,
-                    file_result.access_mode,
-                    file_result.project_root,
-                    tool_name,
-                    timestamp,
-                    1 if file_result.is_glob_expansion else 0,
-                ))
-
+            """Log file access to database with one executemany."""
+            from sqlite.writer import INSERT_FILE_ACCESS_SQL
+
+            is_glob = 1 if file_result.is_glob_expansion else 0
+            paths = [(file_result.primary_path, 1)] if file_result.primary_path else []
+            paths.extend((path, 0) for path in file_result.related_paths)
+
+            self.conn.executemany(INSERT_FILE_ACCESS_SQL, [
+                (event_id, session_id, path, path, file_result.access_mode,
+                 file_result.project_root, timestamp, tool_name, is_primary, is_glob)
+                for path, is_primary in paths
+            ])
             self.conn.commit()
 
         def log_file_access_from_event(self, session_id, tool_name, tool_input, tool_output, cwd, timestamp):
@@ -253,6 +224,18 @@ def mock_neo4j_driver():
     return mock_driver
 
 
+@pytest.fixture
+def neo4j_writer():
+    """CLINeo4jWriter backed by a fresh mocked driver (shared driver cache cleared)."""
+    import graph.writer
+
+    graph.writer._DRIVERS.clear()
+    with patch('graph.writer.GraphDatabase'):
+        writer = graph.writer.CLINeo4jWriter()
+    yield writer
+    graph.writer._DRIVERS.clear()
+
+
 @pytest.fixture
 def mock_neo4j_available():
     """Patch is_neo4j_available to return True."""
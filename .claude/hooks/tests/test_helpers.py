@@ -1,7 +1,10 @@
 """Unit tests for core/helpers.py extraction functions."""
 
+import hashlib
+import json
 import sys
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 
@@ -10,13 +13,21 @@ HOOKS_DIR = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(HOOKS_DIR))
 
 from core.helpers import (
+    classify_tool,
+    compute_prompt_hash,
     detect_project_root,
     resolve_file_path,
     parse_bash_file_paths,
     extract_glob_results,
     extract_grep_file_matches,
     extract_all_file_paths,
+    get_environment_context,
+    analyze_tool_response,
+    detect_success,
+    get_output_size,
+    json_dumps,
     normalize_path,
+    sanitize_tool_input,
     FilePathResult,
     BashFilePath,
     GrepMatch,
@@ -24,6 +35,52 @@ from core.helpers import (
 )
 
 
+# =============================================================================
+# Test classify_tool()
+# =============================================================================
+
+class TestClassifyTool:
+    """Tests for classify_tool() function."""
+
+    @pytest.mark.unit
+    def test_known_tools(self):
+        """Each listed tool should map to its category."""
+        assert classify_tool('Read') == 'file_ops'
+        assert classify_tool('Glob') == 'search'
+        assert classify_tool('KillShell') == 'bash'
+        assert classify_tool('WebSearch') == 'web'
+        assert classify_tool('Task') == 'task'
+        assert classify_tool('AskUserQuestion') == 'question'
+        assert classify_tool('ExitPlanMode') == 'plan'
+
+    @pytest.mark.unit
+    def test_mcp_and_unknown_tools(self):
+        """MCP tools are detected by prefix; anything else is 'other'."""
+        assert classify_tool('mcp__neo4j__read_neo4j_cypher') == 'mcp'
+        assert classify_tool('SomethingNew') == 'other'
+        assert classify_tool('') == 'other'
+        assert classify_tool(None) == 'other'
+
+
+# =============================================================================
+# Test compute_prompt_hash()
+# =============================================================================
+
+class TestComputePromptHash:
+    """Tests for compute_prompt_hash() function."""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize('prompt', ['', 'fix the bug', 'héllo wörld ✓ ' * 20000])
+    def test_matches_sha256_of_utf8(self, prompt):
+        """Chunked hashing should equal hashing the whole UTF-8 encoding."""
+        assert compute_prompt_hash(prompt) == hashlib.sha256(prompt.encode('utf-8')).hexdigest()
+
+    @pytest.mark.unit
+    def test_none_hashes_as_empty(self):
+        """A missing prompt should hash like the empty string."""
+        assert compute_prompt_hash(None) == compute_prompt_hash('')
+
+
 # =============================================================================
 # Test normalize_path()
 # =============================================================================
@@ -36,6 +93,16 @@ class TestNormalizePath:
         """Unix paths should remain unchanged."""
         assert normalize_path('/home/user/file.py') == '/home/user/file.py'
 
+    @pytest.mark.unit
+    def test_posix_path_returned_as_is(self):
+        """Paths without backslashes should skip str.replace entirely."""
+        class NoReplace(str):
+            def replace(self, *args):
+                raise AssertionError('replace called')
+
+        path = NoReplace('/home/user/file.py')
+        assert normalize_path(path) is path
+
     @pytest.mark.unit
     def test_windows_backslashes_converted(self):
         """Windows backslashes should be converted to forward slashes."""
@@ -814,3 +881,214 @@ class TestResolvedPathDataclass:
         assert result.project_root == '/home/user/project'
         assert result.relative_to_project == 'file.py'
         assert result.exists is True
+
+
+# =============================================================================
+# Test sanitize_tool_input()
+# =============================================================================
+
+class TestSanitizeToolInput:
+    """Tests for sanitize_tool_input() function."""
+
+    @pytest.mark.unit
+    def test_redacts_sensitive_keys_case_insensitive(self):
+        """Keys containing sensitive substrings should be redacted in any case."""
+        result = sanitize_tool_input({
+            'API_KEY': 'abc',
+            'Authorization': 'Bearer x',
+            'db_password': 'hunter2',
+            'client_credential': 'c',
+        })
+        assert set(result.values()) == {'[REDACTED]'}
+
+    @pytest.mark.unit
+    def test_keeps_regular_keys(self):
+        """Non-sensitive keys should pass through unchanged."""
+        tool_input = {'file_path': '/a.py', 'limit': 10}
+        assert sanitize_tool_input(tool_input) == tool_input
+
+    @pytest.mark.unit
+    def test_recurses_into_nested_dicts(self):
+        """Nested dicts should be sanitized too."""
+        result = sanitize_tool_input({'options': {'token': 't', 'mode': 'fast'}})
+        assert result == {'options': {'token': '[REDACTED]', 'mode': 'fast'}}
+
+    @pytest.mark.unit
+    def test_empty_returns_empty_dict(self):
+        """Empty or None input should return an empty dict."""
+        assert sanitize_tool_input({}) == {}
+        assert sanitize_tool_input(None) == {}
+
+    @pytest.mark.unit
+    def test_does_not_mutate_input(self):
+        """Original dict should be left untouched."""
+        tool_input = {'secret': 's'}
+        sanitize_tool_input(tool_input)
+        assert tool_input == {'secret': 's'}
+
+    @pytest.mark.unit
+    def test_key_verdicts_are_memoized(self):
+        """Repeated keys should be answered from the per-key cache."""
+        from core.helpers import _is_sensitive_key
+
+        _is_sensitive_key.cache_clear()
+        for _ in range(3):
+            assert sanitize_tool_input({'MY_API_KEY': 'k', 'command': 'ls'}) == {
+                'MY_API_KEY': '[REDACTED]', 'command': 'ls'
+            }
+
+        info = _is_sensitive_key.cache_info()
+        assert info.misses == 2
+        assert info.hits == 4
+
+
+# =============================================================================
+# Test json_dumps()
+# =============================================================================
+
+class TestJsonDumps:
+    """Tests for json_dumps() function."""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize('use_orjson', [True, False])
+    def test_round_trips_with_and_without_orjson(self, use_orjson):
+        """Output should decode to the same value whichever encoder runs."""
+        import core.helpers
+
+        value = {'tool_input': {'path': 'ü/a.py', 'n': [1, 2.5, None, True]}, 1: 'x'}
+        encoder = core.helpers.orjson if use_orjson else None
+        if use_orjson and encoder is None:
+            pytest.skip('orjson not installed')
+
+        with patch.object(core.helpers, 'orjson', encoder):
+            result = json_dumps(value)
+
+        assert json.loads(result) == {'tool_input': {'path': 'ü/a.py', 'n': [1, 2.5, None, True]}, '1': 'x'}
+
+    @pytest.mark.unit
+    def test_unknown_types_stringified(self):
+        """Non-JSON types should fall back to str(), like default=str."""
+        assert json.loads(json_dumps({'p': Path('/tmp/a')})) == {'p': str(Path('/tmp/a'))}
+
+    @pytest.mark.unit
+    def test_oversized_int_falls_back_to_stdlib(self):
+        """Integers orjson cannot encode should still serialize."""
+        assert json.loads(json_dumps({'n': 2 ** 70})) == {'n': 2 ** 70}
+
+    @pytest.mark.unit
+    def test_stdlib_fallback_is_compact(self):
+        """Without orjson the output should carry no separator whitespace."""
+        import core.helpers
+
+        with patch.object(core.helpers, 'orjson', None):
+            assert json_dumps({'a': [1, 2], 'b': {'c': None}}) == '{"a":[1,2],"b":{"c":null}}'
+
+    @pytest.mark.unit
+    def test_lone_surrogate_still_encodable(self):
+        """Strings orjson rejects should come back as UTF-8-safe JSON."""
+        result = json_dumps({'s': 'bad\ud800'})
+        result.encode('utf-8')
+        assert json.loads(result) == {'s': 'bad\ud800'}
+
+
+# =============================================================================
+# Test get_environment_context()
+# =============================================================================
+
+class TestGetEnvironmentContext:
+    """Tests for the cached environment lookups."""
+
+    @pytest.mark.unit
+    def test_git_branch_reused_within_ttl(self):
+        """Repeated calls should fork git once until the TTL expires."""
+        import core.helpers
+
+        core.helpers._git_branch_cache.clear()
+        with patch.object(core.helpers, 'get_git_branch', return_value='main') as lookup:
+            with patch.object(core.helpers.time, 'monotonic', return_value=1000.0):
+                first = get_environment_context()
+                second = get_environment_context()
+            assert lookup.call_count == 1
+
+            expired = 1000.0 + core.helpers.GIT_BRANCH_TTL_SECONDS + 1
+            with patch.object(core.helpers.time, 'monotonic', return_value=expired):
+                get_environment_context()
+            assert lookup.call_count == 2
+        core.helpers._git_branch_cache.clear()
+
+        assert first == second
+        assert first['git_branch'] == 'main'
+        assert first['platform'] and first['python_version']
+
+    @pytest.mark.unit
+    @pytest.mark.skipif(sys.platform == 'win32', reason='cannot remove the working directory on Windows')
+    def test_deleted_working_directory(self, tmp_path):
+        """A removed cwd should yield no branch instead of raising."""
+        import os
+
+        gone = tmp_path / 'gone'
+        gone.mkdir()
+        original = os.getcwd()
+        os.chdir(gone)
+        try:
+            gone.rmdir()
+            context = get_environment_context()
+        finally:
+            os.chdir(original)
+
+        assert context['git_branch'] is None
+
+
+# =============================================================================
+# Test detect_success()
+# =============================================================================
+
+class TestDetectSuccess:
+    """Tests for detect_success() error keyword detection."""
+
+    @pytest.mark.unit
+    def test_keywords_match_case_insensitively(self):
+        """Error keywords in either stream should fail the call regardless of case."""
+        assert detect_success({'stdout': 'all good', 'stderr': ''}) == (True, None, False, False)
+        assert detect_success({'stdout': 'FATAL: bad ref'})[0] is False
+        assert detect_success({'stdout': '', 'stderr': 'Permission Denied'})[1] == 'Permission Denied'
+        assert detect_success('Build FAILED')[:2] == (False, 'Build FAILED')
+
+    @pytest.mark.unit
+    def test_non_str_streams_checked_as_text(self):
+        """List or numeric stdout/stderr values should not raise."""
+        assert detect_success({'stdout': ['ok', 'done'], 'stderr': 0}) == (True, None, False, False)
+        assert detect_success({'stdout': ['fatal: no repo']})[:2] == (False, "['fatal: no repo']")
+        assert detect_success({'stderr': ['Error']})[:3] == (False, "['Error']", True)
+
+    @pytest.mark.unit
+    def test_error_lines_extracted_from_stdout(self):
+        """Without stderr, the matching stdout lines become the error message."""
+        stdout = 'step 1 ok\nTraceback (most recent call last)\nstep 2 ok\nValueError: boom'
+        success, error_msg, has_stderr, _ = detect_success({'stdout': stdout})
+
+        assert success is False
+        assert has_stderr is False
+        assert error_msg == 'Traceback (most recent call last)\nValueError: boom'
+
+
+# =============================================================================
+# Test analyze_tool_response()
+# =============================================================================
+
+class TestAnalyzeToolResponse:
+    """Tests for analyze_tool_response() combined analysis."""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize('response', [
+        None,
+        'ok',
+        'Traceback: something failed',
+        'café ✓',
+        {'stdout': 'done', 'stderr': 'permission denied'},
+        ['a', 'b'],
+    ])
+    def test_matches_separate_helpers(self, response):
+        """Result should equal detect_success() plus get_output_size()."""
+        expected = (*detect_success(response), get_output_size(response))
+        assert analyze_tool_response(response) == expected
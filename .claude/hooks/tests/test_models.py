@@ -518,3 +518,36 @@ class TestFileAccessEvent:
         )
         assert isinstance(event.timestamp, datetime)
         assert event.timestamp == now
+
+
+# =============================================================================
+# Test slots
+# =============================================================================
+
+class TestSlots:
+    """All event models should be slotted dataclasses."""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize('model', [
+        CLISessionStartEvent,
+        CLISessionEndEvent,
+        CLIToolCallEvent,
+        CLIToolResultEvent,
+        CLIPromptEvent,
+        FileAccessEvent,
+    ])
+    def test_model_has_slots(self, model):
+        """Models should define __slots__ and carry no instance __dict__."""
+        assert hasattr(model, '__slots__')
+        assert '__dict__' not in dir(model)
+
+    @pytest.mark.unit
+    def test_unknown_attribute_rejected(self):
+        """Assigning an undeclared attribute should fail."""
+        event = CLIPromptEvent(
+            session_id='test-session-001',
+            prompt_text='hello',
+            timestamp=datetime.now(),
+        )
+        with pytest.raises(AttributeError):
+            event.not_a_field = 1
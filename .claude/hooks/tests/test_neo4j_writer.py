@@ -125,24 +125,36 @@ class TestUpdateCoAccessRelationships:
     @pytest.mark.unit
     def test_creates_relationships_for_pairs(self):
         """Should create CO_ACCESSED_WITH for all pairs."""
-        file_paths = ['/src/a.py', '/src/b.py', '/src/c.py']
+        from graph.writer import _co_access_pairs
+
+        pairs = _co_access_pairs(['/src/a.py', '/src/b.py', '/src/c.py'])
         # n files = n*(n-1)/2 relationships = 3*2/2 = 3
-        expected_rels = len(file_paths) * (len(file_paths) - 1) // 2
-        assert expected_rels == 3
+        assert len(pairs) == 3
 
     @pytest.mark.unit
     def test_five_files_creates_ten_relationships(self):
         """5 files should create 10 relationships."""
-        file_paths = ['a', 'b', 'c', 'd', 'e']
-        expected_rels = len(file_paths) * (len(file_paths) - 1) // 2
-        assert expected_rels == 10
+        from graph.writer import _co_access_pairs
+
+        assert len(_co_access_pairs(['a', 'b', 'c', 'd', 'e'])) == 10
 
     @pytest.mark.unit
     def test_single_file_creates_no_relationships(self):
         """Single file should not create any relationships."""
-        file_paths = ['/src/only.py']
-        # Can't create pairs with one file
-        assert len(file_paths) < 2
+        from graph.writer import _co_access_pairs
+
+        assert _co_access_pairs(['/src/only.py', '/src/only.py']) == []
+
+    @pytest.mark.unit
+    def test_pairs_bounded_by_window(self):
+        """Each file should only pair with the preceding window of files."""
+        from graph.writer import _co_access_pairs
+
+        paths = [f'/src/{i:03d}.py' for i in range(100)]
+        pairs = _co_access_pairs(paths, window=10)
+        # First 10 files pair among themselves, every later file adds 10
+        assert len(pairs) == 45 + 90 * 10
+        assert {'path1': '/src/000.py', 'path2': '/src/099.py'} not in pairs
 
     @pytest.mark.unit
     def test_increments_co_access_count(self):
@@ -153,8 +165,10 @@ class TestUpdateCoAccessRelationships:
     @pytest.mark.unit
     def test_avoids_duplicate_relationships(self):
         """Should not create A→B and B→A duplicates."""
-        # Query contains: WHERE path1 < path2
-        pass  # Query verification only
+        from graph.writer import _co_access_pairs
+
+        pairs = _co_access_pairs(['/b.py', '/a.py', '/b.py', '/a.py'])
+        assert pairs == [{'path1': '/a.py', 'path2': '/b.py'}]
 
 
 # =============================================================================
@@ -193,6 +207,60 @@ class TestCreateSessionFileAccess:
         pass  # Query verification only
 
 
+# =============================================================================
+# Test record_file_accesses_bulk()
+# =============================================================================
+
+class TestRecordFileAccessesBulk:
+    """Tests for record_file_accesses_bulk() method."""
+
+    @pytest.mark.unit
+    def test_single_query_for_all_records(self, neo4j_writer):
+        """All accesses should be sent as one UNWIND parameter."""
+        writer = neo4j_writer
+
+        with patch.object(writer, '_write') as mock_write:
+            writer.record_file_accesses_bulk('s1', [
+                {'path': '/p/a.py', 'access_mode': 'read', 'timestamp': '2024-01-01T00:00:00'},
+                {'path': 'b.MD', 'access_mode': 'write', 'timestamp': '2024-01-01T00:00:01'},
+                {'path': None, 'access_mode': 'read', 'timestamp': '2024-01-01T00:00:02'},
+            ])
+
+        mock_write.assert_called_once()
+        query, params = mock_write.call_args.args
+        assert 'UNWIND $rows' in query
+        assert params['session_id'] == 's1'
+        assert [r['path'] for r in params['rows']] == ['/p/a.py', 'b.MD']
+        assert params['rows'][0]['name'] == 'a.py'
+        assert params['rows'][1]['extension'] == 'md'
+        assert params['rows'][1]['path_suffix'] == '/b.MD'
+
+    @pytest.mark.unit
+    def test_empty_records_no_query(self, neo4j_writer):
+        """No valid paths should mean no query."""
+        writer = neo4j_writer
+
+        with patch.object(writer, '_write') as mock_write:
+            writer.record_file_accesses_bulk('s1', [{'path': ''}])
+
+        mock_write.assert_not_called()
+
+    @pytest.mark.unit
+    def test_merge_unified_files_bulk(self, neo4j_writer):
+        """Session-less bulk merge should UNWIND the same row shape."""
+        with patch.object(neo4j_writer, '_write') as mock_write:
+            neo4j_writer.merge_unified_files_bulk([
+                {'path': '/p/a.py', 'access_mode': 'write', 'project_root': '/p'},
+                {'path': None},
+            ])
+
+        query, params = mock_write.call_args.args
+        assert 'UNWIND $rows' in query
+        assert 'ClaudeCodeSession' not in query
+        assert [r['path'] for r in params['rows']] == ['/p/a.py']
+        assert params['rows'][0]['access_mode'] == 'write'
+
+
 # =============================================================================
 # Test migrate_file_to_unified()
 # =============================================================================
@@ -201,11 +269,51 @@ class TestMigrateFileToUnified:
     """Tests for migrate_file_to_unified() migration method."""
 
     @pytest.mark.unit
-    def test_returns_migration_stats(self):
+    def test_returns_migration_stats(self, neo4j_writer):
         """Should return dict with migration statistics."""
-        expected_keys = ['files_migrated', 'filenode_links', 'access_rels_migrated', 'success']
-        # The return dict should have these keys
-        assert len(expected_keys) == 4
+        writer = neo4j_writer
+        session = writer.driver.session.return_value.__enter__.return_value
+        session.run.return_value.single.return_value = {
+            'count': 3, 'created': 3, 'linked': 1, 'migrated': 5,
+        }
+
+        stats = writer.migrate_file_to_unified()
+
+        assert stats['success'] is True
+        assert stats['source_file_count'] == 3
+        assert stats['files_migrated'] == 3
+        assert stats['filenode_links'] == 1
+        assert stats['access_rels_migrated'] == 5
+
+    @pytest.mark.unit
+    def test_commits_in_batches(self, neo4j_writer):
+        """Migration steps should use CALL { } IN TRANSACTIONS."""
+        writer = neo4j_writer
+        session = writer.driver.session.return_value.__enter__.return_value
+
+        writer.migrate_file_to_unified(batch_size=500)
+
+        batched = [c for c in session.run.call_args_list
+                   if 'IN TRANSACTIONS OF $batch_size ROWS' in c.args[0]]
+        assert batched
+        assert all(c.args[1] == {'batch_size': 500} for c in batched)
+        session.execute_write.assert_not_called()
+
+    @pytest.mark.unit
+    def test_ensures_path_indexes_first(self, neo4j_writer):
+        """Path indexes should be created before the migration query runs."""
+        writer = neo4j_writer
+        session = writer.driver.session.return_value.__enter__.return_value
+
+        writer.migrate_file_to_unified()
+
+        queries = [c.args[0] for c in session.run.call_args_list]
+        index_queries = [q for q in queries if 'CREATE INDEX' in q]
+        assert len(index_queries) == 3
+        assert any('UnifiedFile' in q for q in index_queries)
+        assert queries.index(index_queries[0]) < next(
+            i for i, q in enumerate(queries) if 'MERGE (uf:UnifiedFile' in q
+        )
 
     @pytest.mark.unit
     def test_creates_unified_file_from_file(self):
@@ -226,6 +334,140 @@ class TestMigrateFileToUnified:
         pass  # Query verification only
 
 
+# =============================================================================
+# Test batch()
+# =============================================================================
+
+class TestBatch:
+    """Tests for batch() single-transaction scope."""
+
+    @staticmethod
+    def _tx_mocks(writer):
+        session = writer.driver.session.return_value.__enter__.return_value
+        tx = session.begin_transaction.return_value.__enter__.return_value
+        return session, tx
+
+    @pytest.mark.unit
+    def test_methods_share_one_transaction(self, neo4j_writer):
+        """All writes inside batch() should run on the same tx and commit once."""
+        writer = neo4j_writer
+        session, tx = self._tx_mocks(writer)
+
+        with writer.batch() as scope:
+            scope.create_session_file_access('s1', '/a.py', 'read', '2024-01-01T00:00:00')
+            scope.merge_unified_file('/a.py', 'read')
+
+        assert tx.run.call_count == 2
+        tx.commit.assert_called_once()
+        session.execute_write.assert_not_called()
+
+    @pytest.mark.unit
+    def test_no_commit_on_error(self, neo4j_writer):
+        """An exception inside batch() should skip the commit."""
+        writer = neo4j_writer
+        session, tx = self._tx_mocks(writer)
+
+        with pytest.raises(RuntimeError):
+            with writer.batch() as scope:
+                scope.merge_unified_file('/a.py', 'read')
+                raise RuntimeError("boom")
+
+        tx.commit.assert_not_called()
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize('method', ['batch', 'ensure_path_indexes', 'migrate_file_to_unified'])
+    def test_session_methods_rejected_in_scope(self, neo4j_writer, method):
+        """Methods that open their own sessions should fail clearly inside batch()."""
+        with neo4j_writer.batch() as scope:
+            with pytest.raises(RuntimeError, match='cannot run inside batch'):
+                getattr(scope, method)()
+
+
+# =============================================================================
+# Test shared driver
+# =============================================================================
+
+class TestSharedDriver:
+    """Tests for the process-wide driver and database binding."""
+
+    @pytest.mark.unit
+    def test_writers_share_one_driver(self, neo4j_writer):
+        """A second writer should reuse the first writer's driver."""
+        from graph.writer import CLINeo4jWriter
+
+        driver = neo4j_writer.driver
+        with CLINeo4jWriter() as other:
+            assert other.driver is driver
+        driver.close.assert_not_called()
+
+    @pytest.mark.unit
+    def test_changed_settings_get_their_own_driver(self):
+        """A different password or pool setting must not reuse a stale driver."""
+        from dataclasses import replace
+
+        import graph.writer
+        from core.config import Neo4jConfig
+
+        config = Neo4jConfig(uri='bolt://h:7687', user='neo4j', password='a')
+        graph.writer._DRIVERS.clear()
+        with patch('graph.writer.GraphDatabase') as mock_gd:
+            mock_gd.driver.side_effect = lambda *args, **kwargs: MagicMock()
+            first = graph.writer.get_driver(config)
+            assert graph.writer.get_driver(replace(config)) is first
+            assert graph.writer.get_driver(replace(config, password='b')) is not first
+            assert graph.writer.get_driver(replace(config, max_connection_pool_size=5)) is not first
+        graph.writer._DRIVERS.clear()
+
+    @pytest.mark.unit
+    def test_sessions_bound_to_database(self, neo4j_writer):
+        """Every session should be opened with the configured database."""
+        neo4j_writer.merge_unified_file('/a.py', 'read')
+        neo4j_writer.driver.session.assert_called_with(database=neo4j_writer.database)
+
+
+# =============================================================================
+# Test _truncate_output()
+# =============================================================================
+
+class TestTruncateOutput:
+    """Tests for the byte-aware output truncator."""
+
+    @pytest.mark.unit
+    def test_short_string_unchanged(self):
+        """Strings under the limit should be returned as-is."""
+        from graph.writer import _truncate_output
+        assert _truncate_output('ok', 100) == 'ok'
+
+    @pytest.mark.unit
+    def test_limit_is_in_utf8_bytes(self):
+        """Multi-byte text should be cut on bytes without splitting a char."""
+        from graph.writer import _truncate_output
+        result = _truncate_output('\u00e9' * 100, 51)
+        assert len(result.encode('utf-8')) == 50
+        assert result == '\u00e9' * 25
+
+    @pytest.mark.unit
+    def test_dict_rendered_as_json(self):
+        """Dicts should be JSON-encoded and truncated."""
+        from graph.writer import _truncate_output
+        result = _truncate_output({'stdout': 'x' * 10000}, 20)
+        assert result == '{"stdout": "xxxxxxxx'
+
+    @pytest.mark.unit
+    def test_none_and_bytes(self):
+        """None should become empty and bytes should be decoded."""
+        from graph.writer import _truncate_output
+        assert _truncate_output(None) == ''
+        assert _truncate_output(b'abc') == 'abc'
+
+    @pytest.mark.unit
+    def test_bytes_invalid_sequences_replaced(self):
+        """Invalid bytes become U+FFFD; a char cut at the limit is dropped."""
+        from graph.writer import _truncate_output
+        assert _truncate_output(b'a\xffb') == 'a\ufffdb'
+        assert _truncate_output('ab\u00e9'.encode('utf-8'), 3) == 'ab'
+
+
 # =============================================================================
 # Test UnifiedFile Node Properties
 # =============================================================================
@@ -290,6 +532,29 @@ class TestExistingWriterMethods:
         """create_prompt_node should still work."""
         pass  # Integration test in test_sync.py
 
+    @pytest.mark.unit
+    def test_tool_call_ids_keep_full_timestamp_precision(self, neo4j_writer):
+        """Parallel calls within one millisecond must still get distinct node ids."""
+        from core.models import CLIToolResultEvent
+
+        events = [
+            CLIToolResultEvent(
+                session_id='s1', tool_name='Read', tool_input={}, tool_output='',
+                timestamp=datetime(2024, 1, 1, 0, 0, 0, micro), call_id=f'c{micro}',
+            )
+            for micro in (1100, 1900)
+        ]
+
+        with patch.object(neo4j_writer, '_write') as mock_write:
+            for event in events:
+                neo4j_writer.create_tool_call_node(event)
+
+        ids = [call.args[1]['id'] for call in mock_write.call_args_list]
+        assert ids == [
+            'cli_tool:s1:2024-01-01T00:00:00.001100:Read',
+            'cli_tool:s1:2024-01-01T00:00:00.001900:Read',
+        ]
+
 
 # =============================================================================
 # Test Error Handling
@@ -342,9 +607,9 @@ class TestCypherQueryStructure:
     def test_co_access_query_uses_unwind(self):
         """CO_ACCESSED_WITH query should use UNWIND for efficiency."""
         expected_elements = [
-            'UNWIND $paths as path1',
-            'UNWIND $paths as path2',
-            'WHERE path1 < path2',
+            'UNWIND $pairs as pair',
+            'MATCH (f1:UnifiedFile {path: pair.path1})',
+            'MATCH (f2:UnifiedFile {path: pair.path2})',
             'MERGE (f1)-[r:CO_ACCESSED_WITH]-(f2)',
         ]
         assert len(expected_elements) == 4
@@ -1,6 +1,8 @@
 """Unit tests for sqlite/reader.py query methods."""
 
+import sqlite3
 import sys
+import threading
 from datetime import datetime
 from pathlib import Path
 from unittest.mock import patch
@@ -55,6 +57,24 @@ class TestGetFileAccesses:
                 result = reader.get_file_accesses('nonexistent-session')
                 assert result == []
 
+    @pytest.mark.integration
+    def test_iter_yields_rows(self, populated_file_access_db):
+        """iter_file_accesses() should stream sqlite3.Row objects."""
+        import sqlite3
+
+        with patch('sqlite.reader.get_db_path', return_value=populated_file_access_db['db_path']):
+            from sqlite.reader import CLISqliteReader, as_dicts
+
+            with CLISqliteReader() as reader:
+                session_id = populated_file_access_db['session_id']
+                rows = list(reader.iter_file_accesses(session_id))
+
+                assert all(isinstance(r, sqlite3.Row) for r in rows)
+                assert [r['normalized_path'] for r in rows] == [
+                    r['normalized_path'] for r in reader.get_file_accesses(session_id)
+                ]
+                assert as_dicts(rows) == reader.get_file_accesses(session_id)
+
 
 # =============================================================================
 # Test get_unsynced_file_accesses()
@@ -95,6 +115,60 @@ class TestGetUnsyncedFileAccesses:
                 # Should have 3 less than total
                 assert len(result) == populated_file_access_db['file_count'] - 2
 
+    @pytest.mark.integration
+    def test_batches_page_by_keyset(self, populated_file_access_db):
+        """Batches should cover every unsynced row once, oldest first."""
+        with patch('sqlite.reader.get_db_path', return_value=populated_file_access_db['db_path']):
+            from sqlite.reader import CLISqliteReader
+
+            with CLISqliteReader() as reader:
+                batches = list(reader.iter_unsynced_file_access_batches(batch_size=2))
+
+        assert [len(b) for b in batches] == [2, 2, 1]
+        ids = [row['id'] for batch in batches for row in batch]
+        assert ids == sorted(ids)
+
+    @pytest.mark.integration
+    def test_session_batches(self, temp_sqlite_db, sqlite_writer):
+        """Session pages should follow session_id and skip synced sessions."""
+        sqlite_writer.conn.executemany("""
+            INSERT INTO events (session_id, event_type, timestamp, raw_json, synced_to_neo4j)
+            VALUES (?, 'SessionStart', ?, '{}', ?)
+        """, [
+            ('s-c', '2024-01-03T00:00:00', 0),
+            ('s-a', '2024-01-01T00:00:00', 0),
+            ('s-a', '2024-01-04T00:00:00', 0),
+            ('s-b', '2024-01-02T00:00:00', 0),
+            ('s-done', '2024-01-01T12:00:00', 1),
+        ])
+        sqlite_writer.conn.commit()
+
+        with patch('sqlite.reader.get_db_path', return_value=temp_sqlite_db):
+            from sqlite.reader import CLISqliteReader
+
+            with CLISqliteReader() as reader:
+                batches = list(reader.iter_unsynced_session_batches(batch_size=2))
+                flat = reader.get_unsynced_sessions()
+
+        assert batches == [['s-a', 's-b'], ['s-c']]
+        assert flat == ['s-a', 's-b', 's-c']
+
+    @pytest.mark.integration
+    def test_unsynced_sessions_oldest_first(self, temp_sqlite_db, sqlite_writer):
+        """get_unsynced_sessions should order by each session's first unsynced event."""
+        sqlite_writer.conn.executemany("""
+            INSERT INTO events (session_id, event_type, timestamp, raw_json, synced_to_neo4j)
+            VALUES (?, 'SessionStart', ?, '{}', 0)
+        """, [('s-z', '2024-01-01T00:00:00'), ('s-a', '2024-01-02T00:00:00')])
+        sqlite_writer.conn.commit()
+
+        with patch('sqlite.reader.get_db_path', return_value=temp_sqlite_db):
+            from sqlite.reader import CLISqliteReader
+
+            with CLISqliteReader() as reader:
+                assert reader.get_unsynced_sessions() == ['s-z', 's-a']
+                assert list(reader.iter_unsynced_session_batches()) == [['s-a', 's-z']]
+
 
 # =============================================================================
 # Test get_session_files()
@@ -173,6 +247,21 @@ class TestGetFileAccessSummary:
                 assert 'read' in result['by_mode']
                 assert 'write' in result['by_mode']
 
+    @pytest.mark.integration
+    def test_aggregates_decoded(self, populated_file_access_db):
+        """Counts, mode breakdown and project roots should come back as Python values."""
+        with patch('sqlite.reader.get_db_path', return_value=populated_file_access_db['db_path']):
+            from sqlite.reader import CLISqliteReader
+
+            with CLISqliteReader() as reader:
+                result = reader.get_file_access_summary(populated_file_access_db['session_id'])
+                empty = reader.get_file_access_summary('no-such-session')
+
+        assert result['unique_files'] == 5
+        assert result['by_mode'] == {'read': 4, 'write': 1}
+        assert result['project_roots'] == ['/project']
+        assert empty == {'total_accesses': 0, 'unique_files': 0, 'by_mode': {}, 'project_roots': []}
+
 
 # =============================================================================
 # Test get_co_accessed_files()
@@ -394,6 +483,67 @@ class TestMarkFileAccessesSynced:
                 """, (session2,))
                 assert cursor.fetchone()[0] == 0
 
+    @pytest.mark.integration
+    def test_bulk_marks_many_sessions(self, temp_sqlite_db, sqlite_writer):
+        """Bulk form should mark every listed session across IN-clause chunks."""
+        timestamp = datetime.now().isoformat()
+        sessions = [f'bulk-{i}' for i in range(7)]
+        sqlite_writer.conn.executemany("""
+            INSERT INTO file_access_log
+            (session_id, file_path, normalized_path, access_mode, tool_name, timestamp, synced_to_neo4j)
+            VALUES (?, '/path/file.py', '/path/file.py', 'read', 'Read', ?, 0)
+        """, [(s, timestamp) for s in sessions])
+        sqlite_writer.conn.commit()
+
+        with patch('sqlite.reader.get_db_path', return_value=temp_sqlite_db), \
+             patch('sqlite.reader.IN_CLAUSE_CHUNK_SIZE', 3):
+            from sqlite.reader import CLISqliteReader
+
+            with CLISqliteReader() as reader:
+                reader.mark_sessions_file_accesses_synced(sessions[:-1])
+
+                rows = dict(reader.conn.execute(
+                    "SELECT session_id, synced_to_neo4j FROM file_access_log"
+                ).fetchall())
+
+        assert all(rows[s] == 1 for s in sessions[:-1])
+        assert rows[sessions[-1]] == 0
+
+
+# =============================================================================
+# Test get_subagent_tool_calls_bulk()
+# =============================================================================
+
+class TestGetSubagentToolCallsBulk:
+    """Tests for get_subagent_tool_calls_bulk() method."""
+
+    @pytest.mark.integration
+    def test_groups_by_agent_in_order(self, temp_sqlite_db, sqlite_writer):
+        """Should return each agent's tool calls in timestamp order, keyed by agent."""
+        sqlite_writer.conn.executemany("""
+            INSERT INTO events (session_id, event_type, timestamp, raw_json, tool_name, agent_id)
+            VALUES ('parent', ?, ?, '{}', ?, ?)
+        """, [
+            ('SubagentToolCall', '2024-01-01T00:00:02', 'Grep', 'agent-b'),
+            ('SubagentToolCall', '2024-01-01T00:00:01', 'Read', 'agent-a'),
+            ('SubagentToolCall', '2024-01-01T00:00:03', 'Bash', 'agent-a'),
+            ('SubagentStop', '2024-01-01T00:00:04', None, 'agent-a'),
+        ])
+        sqlite_writer.conn.commit()
+
+        with patch('sqlite.reader.get_db_path', return_value=temp_sqlite_db), \
+             patch('sqlite.reader.IN_CLAUSE_CHUNK_SIZE', 1):
+            from sqlite.reader import CLISqliteReader, as_dicts
+
+            with CLISqliteReader() as reader:
+                result = reader.get_subagent_tool_calls_bulk(['agent-a', 'agent-b', 'agent-c'])
+
+                assert as_dicts(result['agent-a']) == reader.get_subagent_tool_calls('agent-a')
+
+        assert set(result) == {'agent-a', 'agent-b'}
+        assert [c['tool_name'] for c in result['agent-a']] == ['Read', 'Bash']
+        assert [c['tool_name'] for c in result['agent-b']] == ['Grep']
+
 
 # =============================================================================
 # Test Existing Reader Methods (regression)
@@ -420,6 +570,90 @@ class TestExistingReaderMethods:
                 result = reader.get_session_events(populated_file_access_db['session_id'])
                 assert len(result) >= 1
 
+    @pytest.mark.integration
+    def test_connection_pragmas(self, temp_sqlite_db):
+        """Reader connections should use WAL and the tuned PRAGMAs."""
+        with patch('sqlite.reader.get_db_path', return_value=temp_sqlite_db):
+            from sqlite.reader import CLISqliteReader
+
+            with CLISqliteReader() as reader:
+                assert reader.conn.execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+                assert reader.conn.execute("PRAGMA synchronous").fetchone()[0] == 1
+                assert reader.conn.execute("PRAGMA temp_store").fetchone()[0] == 2
+
+    @pytest.mark.integration
+    def test_exit_runs_optimize(self, populated_file_access_db):
+        """Closing the reader should run PRAGMA optimize on its connection."""
+        with patch('sqlite.reader.get_db_path', return_value=populated_file_access_db['db_path']):
+            from sqlite.reader import CLISqliteReader
+
+            with patch('sqlite.reader.optimize_sqlite_connection') as optimize:
+                with CLISqliteReader() as reader:
+                    conn = reader.conn
+                    reader.get_session_files(populated_file_access_db['session_id'])
+
+        optimize.assert_called_once_with(conn)
+
+    @pytest.mark.integration
+    def test_per_thread_connections(self, populated_file_access_db):
+        """Each thread should read through its own connection, all closed on exit."""
+        with patch('sqlite.reader.get_db_path', return_value=populated_file_access_db['db_path']):
+            from sqlite.reader import CLISqliteReader
+
+            seen = {}
+
+            with CLISqliteReader() as reader:
+                def work():
+                    seen['conn'] = reader.conn
+                    seen['files'] = reader.get_session_files(populated_file_access_db['session_id'])
+
+                thread = threading.Thread(target=work)
+                thread.start()
+                thread.join()
+
+                assert seen['conn'] is not reader.conn
+                assert len(seen['files']) == populated_file_access_db['file_count']
+
+            with pytest.raises(sqlite3.ProgrammingError):
+                seen['conn'].execute("SELECT 1")
+
+    @pytest.mark.integration
+    def test_conn_after_exit_raises(self, temp_sqlite_db):
+        """Touching conn after the context exits should not open a leaked connection."""
+        with patch('sqlite.reader.get_db_path', return_value=temp_sqlite_db):
+            from sqlite.reader import CLISqliteReader
+
+            with CLISqliteReader() as reader:
+                pass
+
+            with pytest.raises(sqlite3.ProgrammingError):
+                _ = reader.conn
+            assert reader._conns == []
+
+    @pytest.mark.integration
+    def test_get_session_bundle(self, populated_file_access_db, sqlite_writer):
+        """get_session_bundle should match the per-type getters."""
+        session_id = populated_file_access_db['session_id']
+        cursor = sqlite_writer.conn.cursor()
+        for event_type in ('UserPromptSubmit', 'PostToolUse', 'PostToolUse', 'SessionEnd'):
+            cursor.execute("""
+                INSERT INTO events (session_id, event_type, timestamp, raw_json)
+                VALUES (?, ?, ?, '{}')
+            """, (session_id, event_type, datetime.now().isoformat()))
+        sqlite_writer.conn.commit()
+
+        with patch('sqlite.reader.get_db_path', return_value=populated_file_access_db['db_path']):
+            from sqlite.reader import CLISqliteReader, as_dicts
+
+            with CLISqliteReader() as reader:
+                bundle = reader.get_session_bundle(session_id)
+
+                assert dict(bundle['start']) == reader.get_session_start_event(session_id)
+                assert dict(bundle['end']) == reader.get_session_end_event(session_id)
+                assert as_dicts(bundle['prompts']) == reader.get_prompts(session_id)
+                assert as_dicts(bundle['tool_calls']) == reader.get_tool_calls(session_id)
+                assert len(bundle['tool_calls']) == 2
+
     @pytest.mark.integration
     def test_get_session_summary(self, populated_file_access_db, sqlite_writer):
         """get_session_summary should still work."""
@@ -440,3 +674,62 @@ class TestExistingReaderMethods:
                 assert 'prompt_count' in result
                 assert 'tool_count' in result
                 assert 'tool_usage' in result
+
+    @pytest.mark.integration
+    def test_get_session_summary_values(self, populated_file_access_db, sqlite_writer):
+        """get_session_summary should aggregate prompts, tools and errors in one row."""
+        session_id = populated_file_access_db['session_id']
+        now = datetime.now().isoformat()
+        sqlite_writer.conn.executemany("""
+            INSERT INTO events (session_id, event_type, timestamp, raw_json, tool_name, success)
+            VALUES (?, ?, ?, '{}', ?, ?)
+        """, [
+            (session_id, 'UserPromptSubmit', now, None, None),
+            (session_id, 'PostToolUse', now, 'Read', 1),
+            (session_id, 'PostToolUse', now, 'Read', 0),
+            (session_id, 'PostToolUse', now, 'Bash', 1),
+        ])
+        sqlite_writer.conn.commit()
+
+        with patch('sqlite.reader.get_db_path', return_value=populated_file_access_db['db_path']):
+            from sqlite.reader import CLISqliteReader
+
+            with CLISqliteReader() as reader:
+                result = reader.get_session_summary(session_id)
+                empty = reader.get_session_summary('no-such-session')
+
+        assert result == {
+            'prompt_count': 1,
+            'tool_count': 3,
+            'tool_usage': {'Read': 2, 'Bash': 1},
+            'error_count': 1,
+        }
+        assert empty == {'prompt_count': 0, 'tool_count': 0, 'tool_usage': {}, 'error_count': 0}
+
+    @pytest.mark.integration
+    def test_summaries_keep_null_tool_name_bucket(self, temp_sqlite_db, sqlite_writer):
+        """Rows without a tool_name should be counted under None, not a placeholder."""
+        now = datetime.now().isoformat()
+        sqlite_writer.conn.executemany("""
+            INSERT INTO events (session_id, event_type, timestamp, raw_json, tool_name,
+                                parent_session_id, agent_id, is_subagent_event)
+            VALUES (?, ?, ?, '{}', ?, ?, ?, ?)
+        """, [
+            ('s1', 'PostToolUse', now, None, None, None, 0),
+            ('s1', 'PostToolUse', now, 'unknown', None, None, 0),
+            ('sub', 'SubagentToolCall', now, None, 's1', 'a1', 1),
+            ('sub', 'SubagentToolCall', now, None, 's1', 'a1', 1),
+            ('sub', 'SubagentToolCall', now, 'Read', 's1', 'a1', 1),
+        ])
+        sqlite_writer.conn.commit()
+
+        with patch('sqlite.reader.get_db_path', return_value=temp_sqlite_db):
+            from sqlite.reader import CLISqliteReader
+
+            with CLISqliteReader() as reader:
+                session = reader.get_session_summary('s1')
+                subagents = reader.get_subagent_summary('s1')
+
+        assert session['tool_usage'] == {None: 1, 'unknown': 1}
+        assert subagents['tool_usage'] == {None: 2, 'Read': 1}
+        assert subagents['total_tool_calls'] == 3
@@ -102,6 +102,50 @@ class TestSchemaV7:
         assert any('path' in idx.lower() for idx in indexes)
         assert any('session' in idx.lower() for idx in indexes)
 
+    @pytest.mark.integration
+    def test_reader_covering_indexes_exist(self, temp_db_path):
+        """Composite indexes used by reader queries should be created."""
+        with patch('sqlite.writer.get_db_path', return_value=temp_db_path):
+            from sqlite.writer import CLISqliteWriter
+
+            with CLISqliteWriter() as writer:
+                cursor = writer.conn.cursor()
+                cursor.execute("SELECT name FROM sqlite_master WHERE type='index'")
+                indexes = {row[0] for row in cursor.fetchall()}
+
+        assert 'idx_events_session_type_ts' in indexes
+        assert 'idx_events_agent_type_ts' in indexes
+        assert 'idx_file_access_session_synced_ts' in indexes
+
+    @pytest.mark.integration
+    def test_partial_indexes_replace_flag_indexes(self, temp_db_path):
+        """Flag columns should only be indexed through partial indexes."""
+        with patch('sqlite.writer.get_db_path', return_value=temp_db_path):
+            from sqlite.schema import OBSOLETE_INDEXES
+            from sqlite.writer import CLISqliteWriter
+
+            with CLISqliteWriter() as writer:
+                partial = {row[0] for row in writer.conn.execute(
+                    "SELECT name FROM sqlite_master WHERE type='index' AND sql LIKE '%WHERE%'"
+                )}
+                indexes = {row[0] for row in writer.conn.execute(
+                    "SELECT name FROM sqlite_master WHERE type='index'"
+                )}
+
+        assert {'idx_events_unsynced', 'idx_events_subagent', 'idx_file_access_unsynced'} <= partial
+        assert not indexes & set(OBSOLETE_INDEXES)
+
+    @pytest.mark.integration
+    def test_connection_uses_wal(self, temp_db_path):
+        """Writer connections should run in WAL with relaxed synchronous."""
+        with patch('sqlite.writer.get_db_path', return_value=temp_db_path):
+            from sqlite.writer import CLISqliteWriter
+
+            with CLISqliteWriter() as writer:
+                assert writer.conn.execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+                assert writer.conn.execute("PRAGMA synchronous").fetchone()[0] == 1
+                assert writer.conn.execute("PRAGMA journal_size_limit").fetchone()[0] == 6144000
+
 
 # =============================================================================
 # Test log_file_access()
@@ -428,6 +472,182 @@ class TestSchemaMigration:
                 count = cursor.fetchone()[0]
                 assert count >= 1
 
+    @pytest.mark.integration
+    def test_v1_database_backfills_extracted_fields(self, temp_db_path):
+        """Upgrading a v1 database should backfill fields parsed from raw_json."""
+        conn = sqlite3.connect(str(temp_db_path))
+        conn.execute("""
+            CREATE TABLE events (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                session_id TEXT NOT NULL,
+                event_type TEXT NOT NULL,
+                timestamp TEXT NOT NULL,
+                raw_json TEXT NOT NULL
+            )
+        """)
+        rows = [
+            ('s1', 'PreToolUse', '2024-01-01T00:00:00',
+             json.dumps({'tool_name': 'Bash', 'tool_use_id': f't{i}',
+                         'tool_input': {'command': f'echo {i}'}}))
+            for i in range(3)
+        ]
+        rows.append(('s1', 'UserPromptSubmit', '2024-01-01T00:00:01',
+                     json.dumps({'prompt': 'fix the bug', 'cwd': '/project'})))
+        rows.append(('s1', 'Stop', '2024-01-01T00:00:02', 'not json'))
+        rows.append(('s1', 'PreToolUse', '2024-01-01T00:00:03',
+                     json.dumps({'tool_name': 'Task', 'tool_use_id': 't9',
+                                 'tool_input': {'subagent_type': 'Explore'}})))
+        conn.executemany(
+            "INSERT INTO events (session_id, event_type, timestamp, raw_json) VALUES (?, ?, ?, ?)",
+            rows
+        )
+        conn.commit()
+        conn.close()
+
+        with patch('sqlite.writer.get_db_path', return_value=temp_db_path):
+            from sqlite.writer import CLISqliteWriter
+
+            with patch('sqlite.schema.BACKFILL_BATCH_SIZE', 2):
+                with CLISqliteWriter() as writer:
+                    backfilled = writer.conn.execute(
+                        "SELECT tool_name, tool_use_id, command, prompt_word_count, cwd "
+                        "FROM events ORDER BY id"
+                    ).fetchall()
+                    subagent_type = writer.conn.execute(
+                        "SELECT subagent_type FROM events WHERE tool_use_id = 't9'"
+                    ).fetchone()[0]
+
+        assert backfilled[:3] == [('Bash', f't{i}', f'echo {i}', None, None) for i in range(3)]
+        assert backfilled[3] == (None, None, None, 3, '/project')
+        assert backfilled[4] == (None, None, None, None, None)
+        assert backfilled[5][:2] == ('Task', 't9')
+        assert subagent_type == 'Explore'
+
+    @pytest.mark.unit
+    def test_extract_fields_omits_none_values(self):
+        """Backfill updates should only carry values that were found."""
+        from sqlite.schema import _extract_fields_from_data
+
+        updates = _extract_fields_from_data('PostToolUse', {
+            'tool_name': 'Read',
+            'tool_use_id': 't1',
+            'tool_input': {'file_path': 'C:\\repo\\a.py'},
+            'tool_response': {'content': 'ok'},
+            'cwd': '',
+        })
+
+        assert None not in updates.values()
+        assert 'cwd' not in updates and 'error_message' not in updates
+        assert updates['file_path'] == 'C:/repo/a.py'
+        assert updates['success'] == 1
+        assert updates['output_size_bytes'] > 0
+
+    @pytest.mark.integration
+    def test_failed_migration_rolls_back_every_step(self, temp_db_path):
+        """A failing step should leave the database exactly as it was."""
+        conn = sqlite3.connect(str(temp_db_path))
+        conn.execute("""
+            CREATE TABLE events (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                session_id TEXT NOT NULL,
+                event_type TEXT NOT NULL,
+                timestamp TEXT NOT NULL,
+                raw_json TEXT NOT NULL
+            )
+        """)
+        conn.commit()
+        conn.close()
+
+        with patch('sqlite.writer.get_db_path', return_value=temp_db_path):
+            from sqlite.writer import CLISqliteWriter
+
+            with patch('sqlite.schema._migrate_schema_v6_to_v7',
+                       side_effect=sqlite3.OperationalError('boom')):
+                with pytest.raises(sqlite3.OperationalError):
+                    with CLISqliteWriter():
+                        pass
+
+        conn = sqlite3.connect(str(temp_db_path))
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(events)")}
+        tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        conn.close()
+
+        assert 'tool_use_id' not in columns
+        assert 'session_cache' not in tables
+        assert version == 0
+
+    @pytest.mark.integration
+    def test_schema_script_initializes_database(self, temp_db_path, capsys):
+        """Running sqlite.schema should create the database once and then report it current."""
+        with patch('sqlite.schema.get_db_path', return_value=temp_db_path):
+            from sqlite import schema
+
+            schema.main()
+            schema.main()
+
+        first, second = capsys.readouterr().out.splitlines()
+        assert first.endswith(f"upgraded v0 -> v{schema.SCHEMA_VERSION}")
+        assert second.endswith(f"v{schema.SCHEMA_VERSION} is current")
+
+    @pytest.mark.integration
+    def test_existing_v7_database_gets_new_indexes(self, temp_sqlite_db):
+        """Opening a v7 database should add the v8 reader indexes and stamp it."""
+        with patch('sqlite.writer.get_db_path', return_value=temp_sqlite_db):
+            from sqlite.writer import CLISqliteWriter
+
+            with CLISqliteWriter() as writer:
+                cursor = writer.conn.cursor()
+                cursor.execute("SELECT name FROM sqlite_master WHERE type='index'")
+                indexes = {row[0] for row in cursor.fetchall()}
+                version = cursor.execute("PRAGMA user_version").fetchone()[0]
+
+        assert 'idx_events_session_type_ts' in indexes
+        assert 'idx_file_access_session_synced_ts' in indexes
+        assert version == CLISqliteWriter.SCHEMA_VERSION
+
+    @pytest.mark.integration
+    def test_migration_drops_obsolete_indexes(self, temp_sqlite_db):
+        """Upgrading should drop the retired single-column indexes."""
+        conn = sqlite3.connect(str(temp_sqlite_db))
+        conn.execute("CREATE INDEX idx_events_synced ON events(synced_to_neo4j)")
+        conn.execute("CREATE INDEX idx_events_session_type ON events(session_id, event_type)")
+        conn.commit()
+        conn.close()
+
+        with patch('sqlite.writer.get_db_path', return_value=temp_sqlite_db):
+            from sqlite.writer import CLISqliteWriter
+
+            with CLISqliteWriter() as writer:
+                indexes = {row[0] for row in writer.conn.execute(
+                    "SELECT name FROM sqlite_master WHERE type='index'"
+                )}
+
+        assert 'idx_events_synced' not in indexes
+        assert 'idx_events_session_type' not in indexes
+        assert 'idx_file_access_session' not in indexes
+        assert 'idx_file_access_unsynced' in indexes
+
+    @pytest.mark.integration
+    def test_user_version_short_circuits_schema_check(self, temp_db_path):
+        """Once stamped with user_version, reopening should skip schema setup."""
+        with patch('sqlite.writer.get_db_path', return_value=temp_db_path):
+            from sqlite.writer import CLISqliteWriter
+
+            with CLISqliteWriter() as writer:
+                version = writer.conn.execute("PRAGMA user_version").fetchone()[0]
+                assert version == CLISqliteWriter.SCHEMA_VERSION
+                writer.conn.execute("DROP INDEX idx_events_session_type_ts")
+                writer.conn.commit()
+
+            with CLISqliteWriter() as writer:
+                cursor = writer.conn.cursor()
+                cursor.execute("SELECT name FROM sqlite_master WHERE type='index'")
+                indexes = {row[0] for row in cursor.fetchall()}
+
+        # Not recreated: the ladder did not run for a stamped database
+        assert 'idx_events_session_type_ts' not in indexes
+
 
 # =============================================================================
 # Test Event Writing with File Access
@@ -485,3 +705,353 @@ class TestEventWritingWithFileAccess:
         assert row is not None
         assert row[0] == event_id
         assert row[1] == 'Read'
+
+
+# =============================================================================
+# Test log_event() transaction
+# =============================================================================
+
+class TestLogEventTransaction:
+    """Tests for the single transaction around log_event()."""
+
+    @pytest.mark.integration
+    def test_one_commit_per_event(self, temp_db_path):
+        """A PreToolUse event should cache, sequence and insert under one COMMIT."""
+        with patch('sqlite.writer.get_db_path', return_value=temp_db_path):
+            from sqlite.writer import CLISqliteWriter
+
+            with CLISqliteWriter() as writer:
+                writer.log_event('txn-session', 'SessionStart', {'cwd': '/tmp'})
+
+                statements = []
+                writer.conn.set_trace_callback(statements.append)
+                writer.log_event('txn-session', 'PreToolUse', {
+                    'tool_name': 'Read',
+                    'tool_use_id': 'tu-1',
+                    'tool_input': {'file_path': '/tmp/a.py'},
+                })
+                writer.conn.set_trace_callback(None)
+
+                row = writer.conn.execute(
+                    "SELECT sequence_index FROM events WHERE event_type = 'PreToolUse'"
+                ).fetchone()
+                cached = writer.get_cached_pre_tool_use('tu-1')
+
+        assert [s for s in statements if s.startswith('BEGIN')] == ['BEGIN IMMEDIATE']
+        assert statements.count('COMMIT') == 1
+        assert row[0] == 0
+        assert cached['tool_name'] == 'Read'
+
+    @pytest.mark.integration
+    def test_failure_rolls_back_whole_event(self, temp_db_path):
+        """An error mid-event should leave neither the event nor its cache writes."""
+        with patch('sqlite.writer.get_db_path', return_value=temp_db_path):
+            from sqlite.writer import CLISqliteWriter
+
+            with CLISqliteWriter() as writer:
+                writer.log_event('txn-session', 'SessionStart', {'cwd': '/tmp'})
+
+                with patch.object(writer, '_process_prompt', side_effect=RuntimeError('boom')):
+                    with pytest.raises(RuntimeError):
+                        writer.log_event('txn-session', 'UserPromptSubmit', {'prompt': 'hi'})
+
+                with patch.object(writer, 'get_next_sequence', side_effect=RuntimeError('boom')):
+                    with pytest.raises(RuntimeError):
+                        writer.log_event('txn-session', 'PreToolUse', {
+                            'tool_name': 'Read', 'tool_use_id': 'tu-2',
+                        })
+
+                count = writer.conn.execute("SELECT COUNT(*) FROM events").fetchone()[0]
+                cached = writer.get_cached_pre_tool_use('tu-2')
+
+                assert not writer._in_txn
+                assert count == 1
+                assert cached is None
+
+
+    @pytest.mark.integration
+    def test_post_tool_use_logs_file_accesses(self, temp_db_path):
+        """PostToolUse should record every accessed path against the new event."""
+        with patch('sqlite.writer.get_db_path', return_value=temp_db_path):
+            from sqlite.writer import CLISqliteWriter
+
+            with CLISqliteWriter() as writer:
+                writer.log_event('fa-session', 'PostToolUse', {
+                    'tool_name': 'Glob',
+                    'tool_use_id': 'tu-glob',
+                    'tool_input': {'path': '/project/src', 'pattern': '*.py'},
+                    'tool_response': '/project/src/a.py\n/project/src/b.py',
+                })
+
+                event_id = writer.conn.execute(
+                    "SELECT id FROM events WHERE tool_use_id = 'tu-glob'"
+                ).fetchone()[0]
+                rows = writer.conn.execute("""
+                    SELECT event_id, file_path, is_primary_target, is_glob_expansion
+                    FROM file_access_log ORDER BY id
+                """).fetchall()
+
+        assert rows == [
+            (event_id, '/project/src', 1, 0),
+            (event_id, '/project/src/a.py', 0, 1),
+            (event_id, '/project/src/b.py', 0, 1),
+        ]
+
+    @pytest.mark.integration
+    def test_caches_share_the_event_timestamp(self, temp_db_path):
+        """Cache rows should carry the same timestamp as the event that wrote them."""
+        with patch('sqlite.writer.get_db_path', return_value=temp_db_path):
+            from sqlite.writer import CLISqliteWriter
+
+            with CLISqliteWriter() as writer:
+                writer.log_event('ts-session', 'SessionStart', {'cwd': '/tmp'})
+                writer.log_event('ts-session', 'PreToolUse', {
+                    'tool_name': 'Read', 'tool_use_id': 'tu-ts',
+                })
+
+                events = dict(writer.conn.execute(
+                    "SELECT event_type, timestamp FROM events WHERE session_id = 'ts-session'"
+                ).fetchall())
+                session = writer.get_cached_session('ts-session')
+                tool = writer.get_cached_pre_tool_use('tu-ts')
+
+        assert session['start_timestamp'] == events['SessionStart']
+        assert tool['start_timestamp'] == events['PreToolUse']
+
+    @pytest.mark.integration
+    def test_session_end_checkpoints_wal(self, temp_db_path):
+        """SessionEnd should run a passive checkpoint after its commit."""
+        with patch('sqlite.writer.get_db_path', return_value=temp_db_path):
+            from sqlite.writer import CLISqliteWriter, WAL_AUTOCHECKPOINT_PAGES
+
+            with CLISqliteWriter() as writer:
+                autocheckpoint = writer.conn.execute("PRAGMA wal_autocheckpoint").fetchone()[0]
+                statements = []
+                writer.conn.set_trace_callback(statements.append)
+                writer.log_event('cp-session', 'UserPromptSubmit', {'prompt': 'hi'})
+                writer.log_event('cp-session', 'SessionEnd', {})
+                writer.conn.set_trace_callback(None)
+
+        checkpoints = [i for i, sql in enumerate(statements) if 'wal_checkpoint' in sql]
+        assert autocheckpoint == WAL_AUTOCHECKPOINT_PAGES
+        assert len(checkpoints) == 1
+        assert statements[checkpoints[0] - 1] == 'COMMIT'
+
+# =============================================================================
+# Test get_next_sequence()
+# =============================================================================
+
+class TestGetNextSequence:
+    """Tests for the atomic sequence counter."""
+
+    @pytest.mark.integration
+    def test_counts_from_zero_per_type(self, temp_db_path):
+        """Each call should return the pre-increment value, per sequence type."""
+        with patch('sqlite.writer.get_db_path', return_value=temp_db_path):
+            from sqlite.writer import CLISqliteWriter
+
+            with CLISqliteWriter() as writer:
+                writer.cache_session_start('seq-session', '/tmp', {})
+
+                tools = [writer.get_next_sequence('seq-session', 'tool') for _ in range(3)]
+                prompt = writer.get_next_sequence('seq-session', 'prompt')
+
+            # Increments are committed, not left pending on the connection
+            conn = sqlite3.connect(str(temp_db_path))
+            stored = conn.execute(
+                "SELECT tool_sequence, prompt_sequence FROM session_cache"
+            ).fetchone()
+            conn.close()
+
+        assert tools == [0, 1, 2]
+        assert prompt == 0
+        assert stored == (3, 1)
+
+    @pytest.mark.integration
+    def test_restarted_session_resets_counters(self, temp_db_path):
+        """Re-caching a session should overwrite it in place with fresh counters."""
+        with patch('sqlite.writer.get_db_path', return_value=temp_db_path):
+            from sqlite.writer import CLISqliteWriter
+
+            with CLISqliteWriter() as writer:
+                writer.cache_session_start('seq-session', '/old', {}, '2024-01-01T00:00:00')
+                writer.get_next_sequence('seq-session', 'tool')
+                writer.cache_session_start('seq-session', '/new', {}, '2024-01-02T00:00:00')
+
+                cached = writer.get_cached_session('seq-session')
+                assert writer.get_next_sequence('seq-session', 'tool') == 0
+
+        assert cached['cwd'] == '/new'
+        assert cached['start_timestamp'] == '2024-01-02T00:00:00'
+
+    @pytest.mark.integration
+    def test_uncached_session_returns_zero(self, temp_db_path):
+        """A session without a cache row should get 0 and create nothing."""
+        with patch('sqlite.writer.get_db_path', return_value=temp_db_path):
+            from sqlite.writer import CLISqliteWriter
+
+            with CLISqliteWriter() as writer:
+                assert writer.get_next_sequence('missing', 'tool') == 0
+                assert writer.get_cached_session('missing') is None
+
+
+# =============================================================================
+# Test fixed-column event INSERT
+# =============================================================================
+
+class TestInsertEvent:
+    """Tests for the fixed-column events INSERT."""
+
+    @pytest.mark.integration
+    def test_columns_match_schema(self, temp_db_path):
+        """EVENT_COLUMNS should list every events column except id, in order."""
+        with patch('sqlite.writer.get_db_path', return_value=temp_db_path):
+            from sqlite.writer import CLISqliteWriter, EVENT_COLUMNS
+
+            with CLISqliteWriter() as writer:
+                columns = [row[1] for row in writer.conn.execute("PRAGMA table_info(events)")]
+
+        assert tuple(columns[1:]) == EVENT_COLUMNS
+
+    @pytest.mark.integration
+    def test_absent_fields_get_schema_defaults(self, temp_db_path):
+        """Unset columns should be NULL or their DEFAULT, same as a partial INSERT."""
+        with patch('sqlite.writer.get_db_path', return_value=temp_db_path):
+            from sqlite.writer import CLISqliteWriter
+
+            with CLISqliteWriter() as writer:
+                event_id = writer._insert_event({
+                    'session_id': 's', 'event_type': 'Stop',
+                    'timestamp': '2024-01-01T00:00:00', 'raw_json': '{}',
+                })
+                row = writer.conn.execute("""
+                    SELECT tool_name, synced_to_neo4j, is_subagent_event, sequence_index
+                    FROM events WHERE id = ?
+                """, (event_id,)).fetchone()
+
+        assert row == (None, 0, 0, 0)
+
+    @pytest.mark.integration
+    def test_post_tool_use_consumes_cache_entry(self, temp_db_path):
+        """PostToolUse should time against the cached PreToolUse and remove it."""
+        with patch('sqlite.writer.get_db_path', return_value=temp_db_path):
+            from sqlite.writer import CLISqliteWriter
+
+            with CLISqliteWriter() as writer:
+                writer.log_event('s', 'PreToolUse', {'tool_name': 'Bash', 'tool_use_id': 'tu-9'})
+                writer.log_event('s', 'PostToolUse', {
+                    'tool_name': 'Bash', 'tool_use_id': 'tu-9', 'tool_response': 'ok',
+                })
+
+                duration = writer.conn.execute(
+                    "SELECT duration_ms FROM events WHERE event_type = 'PostToolUse'"
+                ).fetchone()[0]
+
+                assert duration is not None and duration >= 0
+                assert writer.get_cached_pre_tool_use('tu-9') is None
+                assert writer.pop_cached_pre_tool_use('tu-9') is None
+
+    @pytest.mark.integration
+    def test_post_tool_use_skips_decoding_cached_input(self, temp_db_path):
+        """Timing a PostToolUse should not JSON-decode the cached tool input."""
+        with patch('sqlite.writer.get_db_path', return_value=temp_db_path):
+            from sqlite.writer import CLISqliteWriter
+
+            with CLISqliteWriter() as writer:
+                writer.log_event('s', 'PreToolUse', {
+                    'tool_name': 'Read', 'tool_use_id': 'tu-10',
+                    'tool_input': {'file_path': '/tmp/a.py'},
+                })
+                with patch('sqlite.writer.json.loads', side_effect=AssertionError('decoded')):
+                    writer.log_event('s', 'PostToolUse', {
+                        'tool_name': 'Read', 'tool_use_id': 'tu-10', 'tool_response': 'ok',
+                    })
+
+                duration = writer.conn.execute(
+                    "SELECT duration_ms FROM events WHERE event_type = 'PostToolUse'"
+                ).fetchone()[0]
+
+        assert duration is not None
+
+    @pytest.mark.integration
+    def test_durations_computed_from_cached_start(self, temp_db_path):
+        """Tool and session durations should be measured in SQL against the cached start."""
+        with patch('sqlite.writer.get_db_path', return_value=temp_db_path):
+            from sqlite.writer import CLISqliteWriter
+
+            with CLISqliteWriter() as writer:
+                writer.cache_pre_tool_use('tu-11', 's', 'Bash', {}, '2024-01-01T00:00:00+00:00')
+                writer.cache_pre_tool_use('tu-12', 's', 'Bash', {}, 'not a timestamp')
+                writer.cache_session_start('s', '/project', {}, '2024-01-01T00:00:00Z')
+
+                assert writer._pop_tool_duration_ms('tu-11', '2024-01-01T00:00:01.250000+00:00') == 1250
+                assert writer._pop_tool_duration_ms('tu-12', '2024-01-01T00:00:01+00:00') is None
+                assert writer._pop_tool_duration_ms('missing', '2024-01-01T00:00:01+00:00') is None
+                assert writer._handle_session_end('s', '2024-01-01T01:00:00+00:00') == {'duration_ms': 3600000}
+                assert writer.get_cached_session('s') is None
+
+    @pytest.mark.unit
+    def test_tool_fields_without_tool_name_skip_extractors(self):
+        """No tool name should return the shared all-None fields without extracting."""
+        from sqlite.writer import _EMPTY_TOOL_FIELDS, _tool_fields
+
+        with patch('sqlite.writer.classify_tool') as classify:
+            assert _tool_fields(None, {'command': 'ls'}) is _EMPTY_TOOL_FIELDS
+
+        classify.assert_not_called()
+        assert _tool_fields('Bash', {'command': 'ls'})['command'] == 'ls'
+
+
+# =============================================================================
+# Test log_subagent_tool_calls()
+# =============================================================================
+
+class TestLogSubagentToolCalls:
+    """Tests for batch logging of subagent transcript tool calls."""
+
+    @pytest.mark.integration
+    def test_transcript_logged_with_one_commit(self, temp_db_path):
+        """Every tool call should be written under a single COMMIT."""
+        tool_calls = [
+            {'tool_name': 'Read', 'tool_use_id': f'sub-{i}',
+             'tool_input': {'file_path': f'/project/f{i}.py'},
+             'timestamp': f'2024-01-01T00:00:0{i}'}
+            for i in range(3)
+        ]
+
+        with patch('sqlite.writer.get_db_path', return_value=temp_db_path):
+            from sqlite.writer import CLISqliteWriter
+
+            with CLISqliteWriter() as writer:
+                statements = []
+                writer.conn.set_trace_callback(statements.append)
+                count = writer.log_subagent_tool_calls('parent-1', 'agent-1', tool_calls, 'Explore')
+                writer.conn.set_trace_callback(None)
+
+                rows = writer.conn.execute("""
+                    SELECT session_id, parent_session_id, is_subagent_event, file_path, subagent_type
+                    FROM events WHERE event_type = 'SubagentToolCall' ORDER BY id
+                """).fetchall()
+
+        assert count == 3
+        assert statements.count('COMMIT') == 1
+        assert rows == [
+            ('agent-1', 'parent-1', 1, f'/project/f{i}.py', 'Explore') for i in range(3)
+        ]
+
+    @pytest.mark.integration
+    def test_missing_timestamps_share_one_clock_read(self, temp_db_path):
+        """Tool calls without timestamps should all get the batch's timestamp."""
+        tool_calls = [{'tool_name': 'Bash', 'tool_use_id': f'nots-{i}'} for i in range(3)]
+
+        with patch('sqlite.writer.get_db_path', return_value=temp_db_path):
+            from sqlite.writer import CLISqliteWriter
+
+            with CLISqliteWriter() as writer:
+                writer.log_subagent_tool_calls('parent-2', 'agent-2', tool_calls)
+                timestamps = {row[0] for row in writer.conn.execute(
+                    "SELECT timestamp FROM events WHERE agent_id = 'agent-2'"
+                )}
+
+        assert len(timestamps) == 1
+        assert None not in timestamps
@@ -47,6 +47,31 @@ class TestSyncSessionToNeo4j:
                     # _sync_file_accesses should have been called
                     # (or would be if fully mocked)
 
+    @pytest.mark.integration
+    def test_tool_output_passed_through_decoded(self, temp_db_path):
+        """Dict responses should reach the graph writer undecoded, not as a repr."""
+        with patch('sqlite.writer.get_db_path', return_value=temp_db_path):
+            from sqlite.writer import CLISqliteWriter
+
+            with CLISqliteWriter() as writer:
+                writer.log_event('s1', 'PostToolUse', {
+                    'tool_name': 'Bash', 'tool_use_id': 't1',
+                    'tool_response': {'stdout': 'ok', 'stderr': ''},
+                })
+
+        tx = MagicMock()
+        with patch('sqlite.reader.get_db_path', return_value=temp_db_path), \
+                patch('graph.sync.is_neo4j_available', return_value=True), \
+                patch('graph.sync._detect_machine_id', return_value=None), \
+                patch('graph.sync.CLINeo4jWriter') as mock_writer_class:
+            mock_writer_class.return_value.__enter__.return_value.batch.return_value.__enter__.return_value = tx
+            from graph.sync import sync_session_to_neo4j
+
+            assert sync_session_to_neo4j('s1') is True
+
+        event = tx.create_tool_call_node.call_args.args[0]
+        assert event.tool_output == {'stdout': 'ok', 'stderr': ''}
+
 
 # =============================================================================
 # Test _sync_file_accesses()
@@ -94,6 +119,24 @@ class TestSyncFileAccesses:
                 # Should be unique
                 assert len(files) == len(set(files))
 
+    @pytest.mark.integration
+    def test_sends_accesses_in_one_bulk_call(self, populated_file_access_db):
+        """Should hand every access to the writer in a single bulk call."""
+        with patch('sqlite.reader.get_db_path', return_value=populated_file_access_db['db_path']):
+            from sqlite.reader import CLISqliteReader
+            from graph.sync import _sync_file_accesses
+
+            writer = MagicMock()
+            session_id = populated_file_access_db['session_id']
+
+            with CLISqliteReader() as reader:
+                _sync_file_accesses(session_id, reader, writer)
+
+            writer.record_file_accesses_bulk.assert_called_once()
+            _, records = writer.record_file_accesses_bulk.call_args.args
+            assert len(records) == populated_file_access_db['file_count']
+            writer.update_co_access_relationships.assert_called_once()
+
 
 # =============================================================================
 # Test run_unified_file_migration()
@@ -165,6 +208,28 @@ class TestSyncUnsyncedFileAccesses:
                 result = sync_unsynced_file_accesses()
                 assert isinstance(result, int)
 
+    @pytest.mark.integration
+    def test_merges_with_access_mode_and_marks_synced(self, populated_file_access_db):
+        """Should merge each page in one bulk call and mark the sessions synced."""
+        with patch('sqlite.reader.get_db_path', return_value=populated_file_access_db['db_path']), \
+             patch('graph.sync.is_neo4j_available', return_value=True):
+            with patch('graph.sync.CLINeo4jWriter') as mock_writer_class:
+                mock_writer = MagicMock()
+                mock_writer_class.return_value.__enter__ = MagicMock(return_value=mock_writer)
+                mock_writer_class.return_value.__exit__ = MagicMock(return_value=None)
+
+                from graph.sync import sync_unsynced_file_accesses
+                from sqlite.reader import CLISqliteReader
+
+                assert sync_unsynced_file_accesses() == populated_file_access_db['file_count']
+
+                with CLISqliteReader() as reader:
+                    assert reader.get_unsynced_file_accesses() == []
+
+        records = mock_writer.merge_unified_files_bulk.call_args.args[0]
+        assert {'path': '/project/src/config.py', 'access_mode': 'write',
+                'project_root': '/project'} in records
+
 
 # =============================================================================
 # Test CLI Commands